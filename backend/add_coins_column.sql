@@ -1,5 +1,6 @@
 -- Add coins column to hackathon_appusermember table
 -- This script adds the coins field with a default value of 100
+-- hackathon migration 0007_appusermember_coins now adds the column where it is missing.
 
 ALTER TABLE hackathon_appusermember 
 ADD COLUMN coins INT NOT NULL DEFAULT 100 
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -29,9 +30,25 @@ _load_env_file(BASE_DIR / '.env')
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('SECRET_KEY')
 
+# PBKDF2 rounds for new password hashes. Set AUTH_PBKDF2_ITERATIONS to pin a value, or
+# AUTH_PBKDF2_TARGET_MS to calibrate against this host's hashing speed at startup.
+AUTH_PBKDF2_ITERATIONS = int(os.getenv('AUTH_PBKDF2_ITERATIONS') or 0) or None
+AUTH_PBKDF2_TARGET_MS = int(os.getenv('AUTH_PBKDF2_TARGET_MS') or 0) or None
+
+# Test runs (`manage.py test`, or pytest, which is imported before settings load) need no
+# real work factor; one round keeps fixture setup and logins instant.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+if TESTING:
+    AUTH_PBKDF2_ITERATIONS = 1
+    AUTH_PBKDF2_TARGET_MS = None
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Attach drf_yasg schemas to the API views. Off unless ENABLE_SWAGGER=1; not tied to DEBUG,
+# which is hard-coded on above.
+ENABLE_SWAGGER = os.getenv('ENABLE_SWAGGER') == '1'
+
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', 'localhost:5173', 'bullsandbears-3ts8.onrender.com']
 
 
@@ -50,7 +67,10 @@ INSTALLED_APPS = [
     'corsheaders',
     'hackathon',
 ]
-CORS_ALLOW_ALL_ORIGINS = True
+# Comma-separated origins allowed to call the API (e.g. https://app.example.com). While it
+# is unset every origin is allowed, as before.
+CORS_ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv('CORS_ALLOWED_ORIGINS', '').split(',') if origin.strip()]
+CORS_ALLOW_ALL_ORIGINS = not CORS_ALLOWED_ORIGINS
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -62,15 +82,18 @@ CORS_ALLOW_METHODS = [
 
 
 MIDDLEWARE = [
+    # First, so CORS preflights are answered before any other middleware runs.
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Must stay last: dispatches static API routes without walking urlpatterns.
+    'hackathon.middleware.ExactPathDispatchMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -105,6 +128,10 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Reuse connections across requests instead of reconnecting each time;
+        # health checks drop sockets the server closed while they sat idle.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     },
 }
 
@@ -115,6 +142,22 @@ if not DATABASES['default'].get('NAME'):
     }
 
 
+# Cache
+# Without REDIS_URL each worker keeps its own local-memory cache.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+
+# Cache alias for resolved auth sessions. Only a cache shared by all workers belongs here;
+# unset keeps the per-process session cache in hackathon.auth.
+AUTH_SESSION_CACHE_ALIAS = 'default' if REDIS_URL else None
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -12,6 +12,8 @@ class AppUserMemberAdmin(admin.ModelAdmin):
     list_display = ['user', 'name', 'email', 'phone', 'member_id']
     search_fields = ['name', 'email', 'phone', 'member_id']
     list_filter = ['user']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
 
 @admin.register(AuthSession)
 class AuthSessionAdmin(admin.ModelAdmin):
@@ -19,6 +21,15 @@ class AuthSessionAdmin(admin.ModelAdmin):
     list_filter = ['created_at', 'expires_at']
     search_fields = ['user__username', 'member__name']
     readonly_fields = ['created_at']
+    list_select_related = ['user', 'member__user']
+    raw_id_fields = ['user', 'member']
+
+    def get_queryset(self, request):
+        # The changelist only renders these columns; member.__str__ needs its team's username.
+        return super().get_queryset(request).only(
+            'id', 'created_at', 'expires_at', 'revoked_at',
+            'user__username', 'member__phone', 'member__user__username',
+        )
 
 @admin.register(OtpChallenge)
 class OtpChallengeAdmin(admin.ModelAdmin):
@@ -26,6 +37,8 @@ class OtpChallengeAdmin(admin.ModelAdmin):
     list_filter = ['created_at', 'expires_at']
     search_fields = ['identifier']
     readonly_fields = ['created_at']
+    list_select_related = ['member__user']
+    raw_id_fields = ['member']
 
 @admin.register(VocabWord)
 class VocabWordAdmin(admin.ModelAdmin):
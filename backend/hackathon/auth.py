@@ -4,18 +4,89 @@ import hmac
 import json
 import os
 import secrets
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
+from pathlib import Path
 
+import urllib3
+from orjson import loads as _json_loads
+from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 
+try:
+    from fastpbkdf2 import pbkdf2_hmac as _fast_pbkdf2_hmac
+except ImportError:
+    _fast_pbkdf2_hmac = None
 
 SESSION_COOKIE_NAME = 'app_session'
-PBKDF2_ITERATIONS = 260000
 SESSION_TTL = timedelta(days=7)
+SESSION_CACHE_SIZE = 4096
+# How long the shared cache (AUTH_SESSION_CACHE_ALIAS) serves a resolved session. Logout
+# and deactivation delete the entry there; the per-process cache never holds valid sessions.
+SESSION_CACHE_TTL = timedelta(seconds=60)
+# Unknown/expired/revoked tokens are remembered briefly so repeated bad tokens skip the DB.
+SESSION_CACHE_NEGATIVE_TTL = timedelta(seconds=10)
+
+# hashlib only ships a pure-Python PBKDF2 when CPython was built without OpenSSL,
+# which would make every login many times slower. Prefer the fastpbkdf2
+# binding when installed, otherwise insist on the OpenSSL-backed C function.
+# Platforms with neither can load libcrypto's PKCS5_PBKDF2_HMAC through ctypes.
+if _fast_pbkdf2_hmac is not None:
+    _pbkdf2_hmac = _fast_pbkdf2_hmac
+elif getattr(hashlib.pbkdf2_hmac, '__module__', None) == '_hashlib':
+    _pbkdf2_hmac = hashlib.pbkdf2_hmac
+else:
+    raise ImportError('hashlib.pbkdf2_hmac is not OpenSSL-backed; install fastpbkdf2')
+
+# Bound once so hash_session_token skips the module attribute lookup. On OpenSSL builds
+# this is openssl_sha256, which uses the SHA-NI / ARMv8 SHA2 instructions when present.
+_sha256 = hashlib.sha256
+
+
+# Floor for calibration: never hash new passwords with fewer rounds than the historical default.
+PBKDF2_MIN_ITERATIONS = 260000
+_PBKDF2_CALIBRATION_ROUNDS = 50000
+_PBKDF2_CALIBRATION_FILE = Path(__file__).with_name('.pbkdf2_calibration.json')
+
+
+def _calibrate_pbkdf2_iterations(target_ms: int) -> int:
+    try:
+        cached = json.loads(_PBKDF2_CALIBRATION_FILE.read_text())
+        if cached.get('target_ms') == target_ms:
+            return int(cached['iterations'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    t0 = time.perf_counter()
+    _pbkdf2_hmac('sha256', b'calibration', b'calibration-salt', _PBKDF2_CALIBRATION_ROUNDS, 32)
+    elapsed = time.perf_counter() - t0
+    iterations = max(PBKDF2_MIN_ITERATIONS, int(_PBKDF2_CALIBRATION_ROUNDS * (target_ms / 1000) / elapsed))
+
+    try:
+        _PBKDF2_CALIBRATION_FILE.write_text(json.dumps({'target_ms': target_ms, 'iterations': iterations}))
+    except OSError:
+        # Read-only deploys just recalibrate on every start.
+        pass
+    return iterations
+
+
+def _resolve_pbkdf2_iterations() -> int:
+    # Stored hashes keep their own password_iterations, so changing this only affects new hashes.
+    configured = getattr(settings, 'AUTH_PBKDF2_ITERATIONS', None)
+    if configured:
+        return int(configured)
+    target_ms = getattr(settings, 'AUTH_PBKDF2_TARGET_MS', None)
+    if target_ms:
+        return _calibrate_pbkdf2_iterations(int(target_ms))
+    return PBKDF2_MIN_ITERATIONS
+
+
+PBKDF2_ITERATIONS = _resolve_pbkdf2_iterations()
 
 
 def _b64encode(raw: bytes) -> str:
@@ -26,6 +97,13 @@ def _b64decode(val: str) -> bytes:
     return base64.b64decode(val.encode('ascii'))
 
 
+def _pbkdf2_sha256(password: bytes, salt: bytes, iterations: int, dklen: int = 32) -> bytes:
+    # OpenSSL's PKCS5_PBKDF2_HMAC (and fastpbkdf2) keys the HMAC inner/outer SHA-256
+    # states once per derivation and only runs block compressions per iteration; a
+    # Python-level U-loop over copied contexts is several times slower.
+    return _pbkdf2_hmac('sha256', password, salt, iterations, dklen)
+
+
 def hash_password(password: str, *, salt_b64: str | None = None, iterations: int = PBKDF2_ITERATIONS) -> tuple[str, str, int]:
     if salt_b64 is None:
         salt = secrets.token_bytes(16)
@@ -33,21 +111,153 @@ def hash_password(password: str, *, salt_b64: str | None = None, iterations: int
     else:
         salt = _b64decode(salt_b64)
 
-    dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    dk = _pbkdf2_sha256(password.encode('utf-8'), salt, iterations)
     return salt_b64, _b64encode(dk), iterations
 
 
 def verify_password(password: str, *, salt_b64: str, password_hash_b64: str, iterations: int) -> bool:
-    _, computed_hash_b64, _ = hash_password(password, salt_b64=salt_b64, iterations=iterations)
-    return hmac.compare_digest(computed_hash_b64, password_hash_b64)
+    try:
+        expected = _b64decode(password_hash_b64)
+    except ValueError:
+        return False
+    dk = _pbkdf2_sha256(password.encode('utf-8'), _b64decode(salt_b64), iterations)
+    return hmac.compare_digest(dk, expected)
+
+
+_DUMMY_PASSWORD_SALT = secrets.token_bytes(16)
+
+
+def burn_password_check(password: str) -> None:
+    # Logins for unknown accounts still pay for one derivation, so response time does not
+    # reveal whether the email/phone is registered.
+    _pbkdf2_sha256(password.encode('utf-8'), _DUMMY_PASSWORD_SALT, PBKDF2_ITERATIONS)
 
 
 def create_session_token() -> str:
     return secrets.token_urlsafe(32)
 
 
-def hash_session_token(token: str) -> str:
-    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+def hash_session_token(token: str) -> bytes:
+    # Raw 32-byte digest (AuthSession.token_hash is BINARY(32)); only ever used as an
+    # indexed lookup key, never compared against a secret directly. Tokens carry 256
+    # random bits, so one SHA-256 is enough: key stretching is for guessable passwords.
+    return _sha256(token.encode('utf-8')).digest()
+
+
+_SESSION_CACHE: OrderedDict[bytes, tuple[None, datetime]] = OrderedDict()
+_SESSION_CACHE_LOCK = threading.Lock()
+# Returned by session_cache_get when nothing is cached; a cached None means "known invalid".
+SESSION_CACHE_MISS = object()
+
+
+def _shared_session_cache():
+    # With a shared backend (Redis) configured, every worker sees the same entries and a
+    # logout in one process revokes the token everywhere, so the local LRU is bypassed.
+    alias = getattr(settings, 'AUTH_SESSION_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def _shared_session_key(token_hash: bytes) -> str:
+    return f'sess:{token_hash.hex()}'
+
+
+def session_cache_get(token_hash: bytes):
+    shared = _shared_session_cache()
+    if shared is not None:
+        # Unpickled per call, so the caller already owns its copy.
+        return shared.get(_shared_session_key(token_hash), SESSION_CACHE_MISS)
+
+    now = timezone.now()
+    with _SESSION_CACHE_LOCK:
+        entry = _SESSION_CACHE.get(token_hash)
+        if entry is None:
+            return SESSION_CACHE_MISS
+        session, cached_until = entry
+        if cached_until <= now:
+            del _SESSION_CACHE[token_hash]
+            return SESSION_CACHE_MISS
+        _SESSION_CACHE.move_to_end(token_hash)
+    return session
+
+
+def session_cache_put(token_hash: bytes, session, *, expires_at: datetime) -> None:
+    cached_until = min(expires_at, timezone.now() + SESSION_CACHE_TTL)
+    shared = _shared_session_cache()
+    if shared is not None:
+        timeout = (cached_until - timezone.now()).total_seconds()
+        if timeout > 0:
+            shared.set(_shared_session_key(token_hash), session, timeout)
+        return
+
+    # A valid session cached per process would outlive a logout handled by another worker,
+    # so without a shared cache only "known invalid" entries are kept.
+    if session is not None:
+        return
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE[token_hash] = (None, cached_until)
+        _SESSION_CACHE.move_to_end(token_hash)
+        while len(_SESSION_CACHE) > SESSION_CACHE_SIZE:
+            _SESSION_CACHE.popitem(last=False)
+
+
+def session_cache_put_invalid(token_hash: bytes) -> None:
+    session_cache_put(token_hash, None, expires_at=timezone.now() + SESSION_CACHE_NEGATIVE_TTL)
+
+
+def session_cache_pop(token_hash: bytes) -> None:
+    shared = _shared_session_cache()
+    if shared is not None:
+        shared.delete(_shared_session_key(token_hash))
+        return
+
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE.pop(token_hash, None)
+
+
+def otp_challenges_shared() -> bool:
+    # OTP challenges live in the shared cache only when every worker can see it; the
+    # per-process fallback would lose a challenge whose verify lands on another worker.
+    return _shared_session_cache() is not None
+
+
+def _shared_otp_key(challenge_id: str) -> str:
+    return f'otp:{challenge_id}'
+
+
+def _shared_otp_current_key(member_id: int, identifier: str) -> str:
+    # Points at the member's latest challenge for this identifier, like the DB path's
+    # "consume earlier pending challenges" step.
+    return f'otp:member:{member_id}:{identifier}'
+
+
+def otp_challenge_create(*, member_id: int, identifier: str, ttl: timedelta) -> str:
+    shared = _shared_session_cache()
+    challenge_id = secrets.token_urlsafe(16)
+    current_key = _shared_otp_current_key(member_id, identifier)
+    previous_id = shared.get(current_key)
+    if previous_id is not None:
+        shared.delete(_shared_otp_key(previous_id))
+    shared.set_many(
+        {_shared_otp_key(challenge_id): (member_id, identifier), current_key: challenge_id},
+        ttl.total_seconds(),
+    )
+    return challenge_id
+
+
+def otp_challenge_get(challenge_id: str) -> tuple[int, str] | None:
+    shared = _shared_session_cache()
+    challenge = shared.get(_shared_otp_key(challenge_id))
+    if challenge is None:
+        return None
+    # Two overlapping requests can both leave a challenge behind; only the latest counts.
+    if shared.get(_shared_otp_current_key(*challenge)) != challenge_id:
+        return None
+    return challenge
+
+
+def otp_challenge_consume(challenge_id: str) -> bool:
+    # Only one caller's delete can remove the key, which makes the challenge single-use.
+    return bool(_shared_session_cache().delete(_shared_otp_key(challenge_id)))
 
 
 @dataclass(frozen=True)
@@ -61,119 +271,118 @@ def get_session_times() -> SessionTimes:
     return SessionTimes(created_at=created_at, expires_at=created_at + SESSION_TTL)
 
 
+# length -> (lowest code, number of codes), i.e. codes never start with a zero.
+_OTP_RANGES = {length: (10 ** (length - 1), 9 * 10 ** (length - 1)) for length in range(4, 11)}
+
+
 def create_otp_code(length: int = 6) -> str:
+    if length == 6:
+        return str(secrets.randbelow(900000) + 100000)
     if length < 4:
         raise ValueError('OTP length too short')
-    start = 10 ** (length - 1)
-    end = (10**length) - 1
-    return str(secrets.randbelow(end - start + 1) + start)
+    start, span = _OTP_RANGES.get(length) or (10 ** (length - 1), 9 * 10 ** (length - 1))
+    return str(secrets.randbelow(span) + start)
 
 
-def hash_otp_code(code: str, *, salt_b64: str | None = None, iterations: int = 100000) -> tuple[str, str, int]:
-    return hash_password(code, salt_b64=salt_b64, iterations=iterations)
+_HTTP: urllib3.PoolManager | None = None
+_HTTP_PID: int | None = None
+_HTTP_LOCK = threading.Lock()
 
 
-def verify_otp_code(code: str, *, salt_b64: str, otp_hash_b64: str, iterations: int) -> bool:
-    return verify_password(code, salt_b64=salt_b64, password_hash_b64=otp_hash_b64, iterations=iterations)
+def _get_http() -> urllib3.PoolManager:
+    # Created lazily and keyed by pid so Gunicorn workers forked after import
+    # never share keep-alive sockets with the master process.
+    global _HTTP, _HTTP_PID
+    pid = os.getpid()
+    if _HTTP is None or _HTTP_PID != pid:
+        with _HTTP_LOCK:
+            if _HTTP is None or _HTTP_PID != pid:
+                _HTTP = urllib3.PoolManager(
+                    num_pools=4,
+                    maxsize=16,
+                    retries=urllib3.Retry(total=2, backoff_factor=0.1),
+                    timeout=urllib3.Timeout(connect=3, read=15),
+                )
+                _HTTP_PID = pid
+    return _HTTP
 
 
 class OtpDispatchError(RuntimeError):
     pass
 
 
-def dispatch_otp(*, channel: str, identifier: str, otp: str | None = None, display_name: str | None = None) -> None:
-    url = (os.getenv('OTP_GATEWAY_URL') or '').strip()
-    auth_header = (os.getenv('OTP_GATEWAY_AUTH_HEADER') or '').strip()
+class OtpVerifyError(RuntimeError):
+    pass
 
-    if not url:
-        raise OtpDispatchError('Missing OTP_GATEWAY_URL environment variable')
-    if channel not in {'whatsapp', 'email'}:
-        raise OtpDispatchError('Invalid OTP channel')
-    if not identifier:
-        raise OtpDispatchError('Missing OTP identifier')
 
-    payload = {
-        'GenerateOTP': 'yes',
-        'type': channel,
-        'email_mobile': identifier,
-    }
+_GATEWAY_ENV: tuple[str, dict[str, str]] | None = None
+
+
+def refresh_env() -> None:
+    # Forget the cached gateway settings, e.g. after tests patch the environment.
+    global _GATEWAY_ENV
+    _GATEWAY_ENV = None
+
 
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'Accept': 'application/json',
-    }
-    if auth_header:
-        headers['Authorization'] = auth_header
+def _gateway_env() -> tuple[str, dict[str, str]]:
+    # Read lazily: settings loads .env into os.environ, which may happen after this module is imported.
+    global _GATEWAY_ENV
+    if _GATEWAY_ENV is None:
+        url = (os.getenv('OTP_GATEWAY_URL') or '').strip()
+        auth_header = (os.getenv('OTP_GATEWAY_AUTH_HEADER') or '').strip()
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Accept': 'application/json',
+        }
+        if auth_header:
+            headers['Authorization'] = auth_header
+        _GATEWAY_ENV = (url, headers)
+    return _GATEWAY_ENV
+
+
+def _post_gateway(payload: dict, *, error_cls: type[RuntimeError]) -> dict:
+    url, headers = _gateway_env()
+    if not url:
+        raise error_cls('Missing OTP_GATEWAY_URL environment variable')
 
     raw = urllib.parse.urlencode(payload).encode('utf-8')
-    req = urllib.request.Request(url, data=raw, method='POST', headers=headers)
 
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            status = getattr(resp, 'status', None) or resp.getcode()
-            if status < 200 or status >= 300:
-                raise OtpDispatchError(f'OTP gateway returned HTTP {status}')
+        resp = _get_http().request('POST', url, body=raw, headers=headers)
+    except urllib3.exceptions.HTTPError as exc:
+        raise error_cls('Unable to reach OTP gateway') from exc
 
-            body = resp.read().decode('utf-8')
-            try:
-                payload = json.loads(body)
-            except json.JSONDecodeError as exc:
-                raise OtpDispatchError('OTP gateway returned invalid JSON') from exc
+    if resp.status < 200 or resp.status >= 300:
+        raise error_cls(f'OTP gateway returned HTTP {resp.status}')
 
-            if (payload.get('status') or '').strip().lower() != 'success':
-                raise OtpDispatchError('OTP gateway did not return success')
-    except urllib.error.HTTPError as exc:
-        raise OtpDispatchError(f'OTP gateway returned HTTP {exc.code}') from exc
-    except urllib.error.URLError as exc:
-        raise OtpDispatchError('Unable to reach OTP gateway') from exc
+    try:
+        return _json_loads(resp.data)
+    except ValueError as exc:
+        raise error_cls('OTP gateway returned invalid JSON') from exc
 
 
-class OtpVerifyError(RuntimeError):
-    pass
+def dispatch_otp(*, channel: str, identifier: str, otp: str | None = None, display_name: str | None = None) -> None:
+    if channel not in {'whatsapp', 'email'}:
+        raise OtpDispatchError('Invalid OTP channel')
+    if not identifier:
+        raise OtpDispatchError('Missing OTP identifier')
 
+    payload = _post_gateway(
+        {'GenerateOTP': 'yes', 'type': channel, 'email_mobile': identifier},
+        error_cls=OtpDispatchError,
+    )
+    if (payload.get('status') or '').strip().lower() != 'success':
+        raise OtpDispatchError('OTP gateway did not return success')
 
-def verify_otp_via_gateway(*, identifier: str, otp: str) -> bool:
-    url = (os.getenv('OTP_GATEWAY_URL') or '').strip()
-    auth_header = (os.getenv('OTP_GATEWAY_AUTH_HEADER') or '').strip()
 
-    if not url:
-        raise OtpVerifyError('Missing OTP_GATEWAY_URL environment variable')
+def verify_otp_via_gateway(*, identifier: str, otp: str) -> bool:
     if not identifier:
         raise OtpVerifyError('Missing OTP identifier')
     if not otp:
         raise OtpVerifyError('Missing OTP value')
 
-    payload = {
-        'login_verfication': 'yes',
-        'email_mobile': identifier,
-        'otp': otp,
-        'password': '',
-    }
-
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'Accept': 'application/json',
-    }
-    if auth_header:
-        headers['Authorization'] = auth_header
-
-    raw = urllib.parse.urlencode(payload).encode('utf-8')
-    req = urllib.request.Request(url, data=raw, method='POST', headers=headers)
-
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            status = getattr(resp, 'status', None) or resp.getcode()
-            if status < 200 or status >= 300:
-                raise OtpVerifyError(f'OTP gateway returned HTTP {status}')
-
-            body = resp.read().decode('utf-8')
-            try:
-                payload = json.loads(body)
-            except json.JSONDecodeError as exc:
-                raise OtpVerifyError('OTP gateway returned invalid JSON') from exc
-
-            return (payload.get('status') or '').strip().lower() == 'success'
-    except urllib.error.HTTPError as exc:
-        raise OtpVerifyError(f'OTP gateway returned HTTP {exc.code}') from exc
-    except urllib.error.URLError as exc:
-        raise OtpVerifyError('Unable to reach OTP gateway') from exc
+    payload = _post_gateway(
+        {'login_verfication': 'yes', 'email_mobile': identifier, 'otp': otp, 'password': ''},
+        error_cls=OtpVerifyError,
+    )
+    return (payload.get('status') or '').strip().lower() == 'success'
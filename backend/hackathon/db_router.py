@@ -1,50 +1,46 @@
+from functools import lru_cache
+
+
 class HackathonDbRouter:
-    CORE_MODEL_NAMES = {
+    CORE_MODEL_NAMES = frozenset({
         'appuser',
         'appusermember',
         'authsession',
         'otpchallenge',
-    }
-    
+    })
+
     # Models that use the student database (team25)
-    STUDENT_MODEL_NAMES = {
+    STUDENT_MODEL_NAMES = frozenset({
         'vocabword',  # vocab_words table (existing)
         'gameresult',  # gameresults table (existing)
-    }
+    })
 
-    def db_for_read(self, model, **hints):
+    # Routing is fixed per model class, so resolve it once; Django's model_name is already lower-case.
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _route_for(model):
         if getattr(model._meta, 'app_label', None) != 'hackathon':
             return None
-
-        model_name = getattr(model._meta, 'model_name', '').lower()
-        if model_name in self.CORE_MODEL_NAMES:
+        if model._meta.model_name in HackathonDbRouter.CORE_MODEL_NAMES:
             return 'default'
-        if model_name in self.STUDENT_MODEL_NAMES:
-            return 'student'
         return 'student'
 
-    def db_for_write(self, model, **hints):
-        if getattr(model._meta, 'app_label', None) != 'hackathon':
-            return None
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _is_core(model):
+        return model._meta.model_name in HackathonDbRouter.CORE_MODEL_NAMES
 
-        model_name = getattr(model._meta, 'model_name', '').lower()
-        if model_name in self.CORE_MODEL_NAMES:
-            return 'default'
-        if model_name in self.STUDENT_MODEL_NAMES:
-            return 'student'
-        return 'student'
+    def db_for_read(self, model, **hints):
+        return self._route_for(model)
+
+    def db_for_write(self, model, **hints):
+        return self._route_for(model)
 
     def allow_relation(self, obj1, obj2, **hints):
         if getattr(obj1._meta, 'app_label', None) != 'hackathon' or getattr(obj2._meta, 'app_label', None) != 'hackathon':
             return None
 
-        name1 = getattr(obj1._meta, 'model_name', '').lower()
-        name2 = getattr(obj2._meta, 'model_name', '').lower()
-
-        is_core_1 = name1 in self.CORE_MODEL_NAMES
-        is_core_2 = name2 in self.CORE_MODEL_NAMES
-
-        if is_core_1 != is_core_2:
+        if self._is_core(type(obj1)) != self._is_core(type(obj2)):
             return False
 
         return None
@@ -1,32 +1,38 @@
 import csv
+import io
+import mmap
+import multiprocessing
+import os
 import re
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connections, router, transaction
 
 from hackathon.auth import PBKDF2_ITERATIONS, hash_password
 from hackathon.models import AppUser, AppUserMember
 
 
+_CSV_COLUMNS = frozenset({'Team No.', 'Member ID', 'Name', 'Email', 'Phone'})
 _TEAM_NO_RE = re.compile(r'^\s*Team\s*(\d+)\s*$', flags=re.IGNORECASE)
+_NON_DIGIT_RE = re.compile(r'\D+')
 
 
-def _parse_team_no(raw: str) -> int:
-    match = _TEAM_NO_RE.match((raw or '').strip())
-    if not match:
-        raise ValueError(f'Invalid Team No. value: {raw!r}')
-    return int(match.group(1))
+def _map_readonly(fh):
+    try:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be mapped.
+        return io.BytesIO()
 
 
 def _format_password(team_no: int) -> str:
     return f'Team@{team_no:03d}'
 
 
-def _normalize_phone(raw: str) -> str:
-    phone = re.sub(r'\D+', '', (raw or '').strip())
-    if not phone:
-        raise ValueError('Missing phone')
-    return phone
+def _hash_team_password(team_no: int) -> tuple[str, str, int]:
+    # Module-level so multiprocessing can pickle it.
+    return hash_password(_format_password(team_no), iterations=PBKDF2_ITERATIONS)
 
 
 class Command(BaseCommand):
@@ -55,51 +61,66 @@ class Command(BaseCommand):
         dry_run = options['dry_run']
         append_only = options['append_only']
 
-        try:
-            with open(csv_path, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                expected = {'Team No.', 'Member ID', 'Name', 'Email', 'Phone'}
-                if set(reader.fieldnames or []) != expected:
-                    raise CommandError(f'CSV header must be exactly {sorted(expected)}. Got: {reader.fieldnames}')
-
-                rows = [row for row in reader]
-        except FileNotFoundError as exc:
-            raise CommandError(f'CSV file not found: {csv_path}') from exc
-
         teams: dict[int, list[dict]] = {}
         seen_member_ids: set[str] = set()
 
-        for idx, row in enumerate(rows, start=2):
-            if not (row.get('Team No.') or '').strip() and not (row.get('Phone') or '').strip():
-                continue
-
-            team_no_raw = (row.get('Team No.') or '').strip()
-            member_id = (row.get('Member ID') or '').strip()
-            name = (row.get('Name') or '').strip()
-            email = (row.get('Email') or '').strip() or None
-            phone_raw = row.get('Phone')
-
-            if not team_no_raw and not name and not email and not (phone_raw or '').strip():
-                continue
-
-            if not team_no_raw:
-                raise CommandError(f'Row {idx}: missing Team No.')
-            if not member_id:
-                raise CommandError(f'Row {idx}: missing Member ID')
-            if member_id in seen_member_ids:
-                raise CommandError(f'Row {idx}: duplicate Member ID {member_id!r}')
-            if not name:
-                raise CommandError(f'Row {idx}: missing Name')
-
-            try:
-                team_no = _parse_team_no(team_no_raw)
-                phone = _normalize_phone(phone_raw)
-            except ValueError as exc:
-                raise CommandError(f'Row {idx}: {exc}') from exc
-
-            seen_member_ids.add(member_id)
-
-            teams.setdefault(team_no, []).append({'member_id': member_id, 'name': name, 'email': email, 'phone': phone})
+        try:
+            with open(csv_path, 'rb') as fh, _map_readonly(fh) as mm:
+                # Decode line by line straight off the page cache instead of through a second read buffer.
+                reader = csv.reader(line.decode('utf-8') for line in iter(mm.readline, b''))
+                header = next(reader, None) or []
+                if set(header) != _CSV_COLUMNS:
+                    raise CommandError(f'CSV header must be exactly {sorted(_CSV_COLUMNS)}. Got: {header or None}')
+
+                team_i = header.index('Team No.')
+                member_id_i = header.index('Member ID')
+                name_i = header.index('Name')
+                email_i = header.index('Email')
+                phone_i = header.index('Phone')
+                width = len(header)
+
+                team_re_match = _TEAM_NO_RE.match
+                non_digit_sub = _NON_DIGIT_RE.sub
+                add_seen = seen_member_ids.add
+                setdefault = teams.setdefault
+
+                for idx, row in enumerate(reader, start=2):
+                    if not row:
+                        continue
+                    if len(row) < width:
+                        row += [''] * (width - len(row))
+
+                    team_no_raw = row[team_i].strip()
+                    phone_raw = row[phone_i].strip()
+                    if not team_no_raw and not phone_raw:
+                        continue
+
+                    member_id = row[member_id_i].strip()
+                    name = row[name_i].strip()
+                    email = row[email_i].strip() or None
+
+                    if not team_no_raw:
+                        raise CommandError(f'Row {idx}: missing Team No.')
+                    if not member_id:
+                        raise CommandError(f'Row {idx}: missing Member ID')
+                    if member_id in seen_member_ids:
+                        raise CommandError(f'Row {idx}: duplicate Member ID {member_id!r}')
+                    if not name:
+                        raise CommandError(f'Row {idx}: missing Name')
+
+                    match = team_re_match(team_no_raw)
+                    if not match:
+                        raise CommandError(f'Row {idx}: Invalid Team No. value: {team_no_raw!r}')
+                    phone = non_digit_sub('', phone_raw)
+                    if not phone:
+                        raise CommandError(f'Row {idx}: Missing phone')
+
+                    add_seen(member_id)
+                    setdefault(int(match.group(1)), []).append(
+                        {'member_id': member_id, 'name': name, 'email': email, 'phone': phone}
+                    )
+        except FileNotFoundError as exc:
+            raise CommandError(f'CSV file not found: {csv_path}') from exc
 
         if not teams:
             raise CommandError('No valid team rows found in CSV.')
@@ -122,14 +143,18 @@ class Command(BaseCommand):
                 phones[m['phone']] = m['member_id']
 
         if append_only:
+            existing_team_nos = set(AppUser.objects.filter(team_no__in=teams).values_list('team_no', flat=True))
+            existing_members: defaultdict[int, set[str]] = defaultdict(set)
+            for team_no, member_id in AppUserMember.objects.filter(user__team_no__in=existing_team_nos).values_list(
+                'user__team_no', 'member_id'
+            ):
+                existing_members[team_no].add(member_id)
+
             for team_no, members in teams.items():
-                existing_user = AppUser.objects.filter(team_no=team_no).first()
-                if existing_user is None:
+                if team_no not in existing_team_nos:
                     continue
 
-                existing_member_ids = set(
-                    AppUserMember.objects.filter(user=existing_user).values_list('member_id', flat=True)
-                )
+                existing_member_ids = existing_members[team_no]
                 incoming_member_ids = {m['member_id'] for m in members}
                 new_member_ids = incoming_member_ids - existing_member_ids
                 total_after = len(existing_member_ids) + len(new_member_ids)
@@ -142,55 +167,96 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('Dry-run enabled: no DB changes.'))
             return
 
-        with transaction.atomic():
-            for team_no, members in teams.items():
-                unique_by_member_id: dict[str, dict] = {}
-                for m in members:
-                    unique_by_member_id[m['member_id']] = m
-                members = list(unique_by_member_id.values())
-
-                password = _format_password(team_no)
-                salt_b64, password_hash_b64, iterations = hash_password(password, iterations=PBKDF2_ITERATIONS)
-
-                user, created = AppUser.objects.get_or_create(
-                    team_no=team_no,
-                    defaults={
-                        'username': f'Team {team_no}',
-                        'email': None,
-                        'phone': None,
-                        'password_salt_b64': salt_b64,
-                        'password_hash_b64': password_hash_b64,
-                        'password_iterations': iterations,
-                        'is_active': True,
-                    },
-                )
+        # PBKDF2 is pure CPU work: spread it across cores before opening the transaction.
+        team_nos = list(teams)
+        processes = min(os.cpu_count() or 1, len(team_nos))
+        if processes > 1:
+            with multiprocessing.Pool(processes) as pool:
+                creds_by_team = dict(zip(team_nos, pool.map(_hash_team_password, team_nos)))
+        else:
+            creds_by_team = {team_no: _hash_team_password(team_no) for team_no in team_nos}
 
-                if not append_only and not created:
-                    AppUser.objects.filter(id=user.id).update(
-                        username=f'Team {team_no}',
-                        password_salt_b64=salt_b64,
-                        password_hash_b64=password_hash_b64,
-                        password_iterations=iterations,
-                        is_active=True,
+        with transaction.atomic():
+            users_by_team = {u.team_no: u for u in AppUser.objects.filter(team_no__in=teams)}
+
+            new_users = []
+            updated_users = []
+            for team_no in teams:
+                salt_b64, password_hash_b64, iterations = creds_by_team[team_no]
+
+                user = users_by_team.get(team_no)
+                if user is None:
+                    new_users.append(
+                        AppUser(
+                            team_no=team_no,
+                            username=f'Team {team_no}',
+                            email=None,
+                            phone=None,
+                            password_salt_b64=salt_b64,
+                            password_hash_b64=password_hash_b64,
+                            password_iterations=iterations,
+                            is_active=True,
+                        )
                     )
+                elif not append_only:
+                    user.username = f'Team {team_no}'
+                    user.password_salt_b64 = salt_b64
+                    user.password_hash_b64 = password_hash_b64
+                    user.password_iterations = iterations
+                    user.is_active = True
+                    updated_users.append(user)
+
+            if new_users:
+                AppUser.objects.bulk_create(new_users, batch_size=500)
+                # MySQL does not return primary keys from a bulk INSERT, so read them back.
+                users_by_team = {u.team_no: u for u in AppUser.objects.filter(team_no__in=teams)}
+            if updated_users:
+                AppUser.objects.bulk_update(
+                    updated_users,
+                    ['username', 'password_salt_b64', 'password_hash_b64', 'password_iterations', 'is_active'],
+                    batch_size=500,
+                )
 
-                if not append_only:
-                    AppUserMember.objects.filter(user=user).exclude(member_id__in=[m['member_id'] for m in members]).delete()
-
-                for m in members:
-                    if append_only:
-                        member, created_member = AppUserMember.objects.get_or_create(
-                            member_id=m['member_id'],
-                            defaults={'user': user, 'phone': m['phone'], 'name': m['name'], 'email': m['email']},
-                        )
-                        if not created_member and member.user_id != user.id:
-                            raise CommandError(
-                                f"Member ID {m['member_id']!r} already exists under Team {member.user.team_no}; cannot append into Team {team_no}."
-                            )
-                    else:
-                        AppUserMember.objects.update_or_create(
-                            member_id=m['member_id'],
-                            defaults={'user': user, 'phone': m['phone'], 'name': m['name'], 'email': m['email']},
+            incoming = [
+                AppUserMember(
+                    user=users_by_team[team_no],
+                    member_id=m['member_id'],
+                    name=m['name'],
+                    email=m['email'],
+                    phone=m['phone'],
+                )
+                for team_no, members in teams.items()
+                for m in members
+            ]
+            incoming_member_ids = [m.member_id for m in incoming]
+
+            if append_only:
+                existing_owner = dict(
+                    AppUserMember.objects.filter(member_id__in=incoming_member_ids).values_list('member_id', 'user__team_no')
+                )
+                for m in incoming:
+                    owner_team_no = existing_owner.get(m.member_id, m.user.team_no)
+                    if owner_team_no != m.user.team_no:
+                        raise CommandError(
+                            f"Member ID {m.member_id!r} already exists under Team {owner_team_no}; cannot append into Team {m.user.team_no}."
                         )
+                AppUserMember.objects.bulk_create(
+                    [m for m in incoming if m.member_id not in existing_owner],
+                    batch_size=500,
+                )
+            else:
+                AppUserMember.objects.filter(user__in=users_by_team.values()).exclude(
+                    member_id__in=incoming_member_ids
+                ).delete()
+                # MySQL upserts on any unique key and rejects an explicit conflict target.
+                db_features = connections[router.db_for_write(AppUserMember)].features
+                unique_fields = ['member_id'] if db_features.supports_update_conflicts_with_target else None
+                AppUserMember.objects.bulk_create(
+                    incoming,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=['user', 'phone', 'name', 'email', 'updated_at'],
+                    batch_size=500,
+                )
 
         self.stdout.write(self.style.SUCCESS('Import completed.'))
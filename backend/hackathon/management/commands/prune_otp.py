@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import router
+from django.utils import timezone
+
+from hackathon.models import OtpChallenge
+
+
+class Command(BaseCommand):
+    help = 'Hard-delete OTP challenges that expired long enough ago'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Delete challenges that expired more than this many days ago (default: 1)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows deleted per statement, to keep row locks short (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        batch_size = options['batch_size']
+        # A range scan on the expires_at index; consumed challenges age out the same way.
+        expired = OtpChallenge.objects.filter(expires_at__lt=cutoff)
+
+        using = router.db_for_write(OtpChallenge)
+        deleted = 0
+        while True:
+            ids = list(expired.using(using).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            # Nothing references challenges and they have no signals, so skip the collector.
+            deleted += OtpChallenge.objects.using(using).filter(id__in=ids)._raw_delete(using)
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTP challenges.'))
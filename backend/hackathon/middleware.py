@@ -1,25 +1,76 @@
 from __future__ import annotations
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest, HttpResponse
+from django.urls import ResolverMatch, URLPattern, URLResolver, get_resolver
 
 
-class CorsMiddleware:
+def _collect_exact_routes(resolver: URLResolver, prefix: str, routes: dict, dispatchable: bool = True) -> bool:
+    # Returns False once a dynamic pattern is seen: it could shadow any later static route,
+    # so resolution order is only preserved up to that point.
+    for entry in resolver.url_patterns:
+        route = getattr(entry.pattern, '_route', None)
+        if route is None or entry.pattern.converters:
+            return False
+        if isinstance(entry, URLResolver):
+            # Extra kwargs given to include() reach every view below it.
+            if not _collect_exact_routes(entry, prefix + route, routes, dispatchable and not entry.default_kwargs):
+                return False
+        elif isinstance(entry, URLPattern):
+            # CsrfViewMiddleware.process_view is a no-op for exempt views (all APIViews),
+            # so skipping the view-middleware phase cannot change their behaviour. Views
+            # with extra kwargs would lose them to callback(request). Other views claim
+            # their path (None) so a later duplicate cannot take it over.
+            exempt = getattr(entry.callback, 'csrf_exempt', False)
+            target = (entry.callback, entry.name, prefix + route) if dispatchable and exempt and not entry.default_args else None
+            routes.setdefault('/' + prefix + route, target)
+    return True
+
+
+def _exact_routes(resolver: URLResolver) -> dict[str, tuple]:
+    routes: dict[str, tuple | None] = {}
+    _collect_exact_routes(resolver, '', routes)
+    return {path: target for path, target in routes.items() if target is not None}
+
+
+class ExactPathDispatchMiddleware:
+    """Call views for static, CSRF-exempt routes straight from a dict, skipping URL resolution.
+
+    Must be the last entry in MIDDLEWARE; anything else falls through to the normal resolver.
+    """
+
     def __init__(self, get_response):
+        # Dispatched views skip process_view, process_exception and process_template_response,
+        # and the per-view transaction BaseHandler.make_view_atomic adds for ATOMIC_REQUESTS.
+        # That is only safe while no middleware after this one or database relies on them.
+        dotted_path = f'{type(self).__module__}.{type(self).__qualname__}'
+        if settings.MIDDLEWARE[-1:] != [dotted_path]:
+            raise ImproperlyConfigured(f'{dotted_path} must be the last entry in MIDDLEWARE.')
+        atomic = [alias for alias, db in settings.DATABASES.items() if db.get('ATOMIC_REQUESTS')]
+        if atomic:
+            raise ImproperlyConfigured(
+                f'{dotted_path} bypasses ATOMIC_REQUESTS, which is enabled for: {", ".join(atomic)}.'
+            )
         self.get_response = get_response
+        self._routes_by_urlconf: dict[str, dict[str, tuple]] = {}
+
+    def _routes(self, urlconf: str) -> dict[str, tuple]:
+        routes = self._routes_by_urlconf.get(urlconf)
+        if routes is None:
+            routes = self._routes_by_urlconf[urlconf] = _exact_routes(get_resolver(urlconf))
+        return routes
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        if request.method == 'OPTIONS':
-            response = HttpResponse(status=204)
-        else:
-            response = self.get_response(request)
-
-        origin = request.headers.get('Origin')
-        if origin:
-            response['Access-Control-Allow-Origin'] = origin
-            response['Vary'] = 'Origin'
-            response['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-            response['Access-Control-Allow-Headers'] = 'Authorization, Content-Type'
-            response['Access-Control-Allow-Credentials'] = 'true'
-            response['Access-Control-Max-Age'] = '86400'
+        urlconf = getattr(request, 'urlconf', None) or settings.ROOT_URLCONF
+        target = self._routes(urlconf).get(request.path_info)
+        if target is None:
+            return self.get_response(request)
 
+        callback, url_name, route = target
+        request.resolver_match = ResolverMatch(callback, (), {}, url_name, route=route)
+        response = callback(request)
+        # DRF responses render lazily, as in BaseHandler._get_response.
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
         return response
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='authsession',
+            index=models.Index(
+                fields=['token_hash', 'revoked_at', 'expires_at', 'user', 'member'],
+                name='authsess_tok_covering',
+            ),
+        ),
+    ]
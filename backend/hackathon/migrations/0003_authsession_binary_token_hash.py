@@ -0,0 +1,81 @@
+from django.db import migrations, models
+
+import hackathon.models
+
+BATCH_SIZE = 1000
+
+
+def hex_to_binary(apps, schema_editor):
+    AuthSession = apps.get_model('hackathon', 'AuthSession')
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for session in AuthSession.objects.using(db_alias).only('id', 'token_hash').iterator(chunk_size=BATCH_SIZE):
+        session.token_hash_bin = bytes.fromhex(session.token_hash)
+        batch.append(session)
+        if len(batch) >= BATCH_SIZE:
+            AuthSession.objects.using(db_alias).bulk_update(batch, ['token_hash_bin'])
+            batch = []
+    if batch:
+        AuthSession.objects.using(db_alias).bulk_update(batch, ['token_hash_bin'])
+
+
+def binary_to_hex(apps, schema_editor):
+    AuthSession = apps.get_model('hackathon', 'AuthSession')
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for session in AuthSession.objects.using(db_alias).only('id', 'token_hash_bin').iterator(chunk_size=BATCH_SIZE):
+        session.token_hash = bytes(session.token_hash_bin).hex()
+        batch.append(session)
+        if len(batch) >= BATCH_SIZE:
+            AuthSession.objects.using(db_alias).bulk_update(batch, ['token_hash'])
+            batch = []
+    if batch:
+        AuthSession.objects.using(db_alias).bulk_update(batch, ['token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0002_authsession_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='authsession',
+            name='authsess_tok_covering',
+        ),
+        migrations.AddField(
+            model_name='authsession',
+            name='token_hash_bin',
+            field=hackathon.models.FixedLengthBinaryField(max_length=32, null=True),
+        ),
+        # Nullable while both columns exist, so the migration can also run backwards.
+        migrations.AlterField(
+            model_name='authsession',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True, unique=True),
+        ),
+        # Existing sessions keep working: their hex digests are decoded in place.
+        migrations.RunPython(hex_to_binary, binary_to_hex),
+        migrations.RemoveField(
+            model_name='authsession',
+            name='token_hash',
+        ),
+        migrations.RenameField(
+            model_name='authsession',
+            old_name='token_hash_bin',
+            new_name='token_hash',
+        ),
+        migrations.AlterField(
+            model_name='authsession',
+            name='token_hash',
+            field=hackathon.models.FixedLengthBinaryField(max_length=32, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='authsession',
+            index=models.Index(
+                fields=['token_hash', 'revoked_at', 'expires_at', 'user', 'member'],
+                name='authsess_tok_covering',
+            ),
+        ),
+    ]
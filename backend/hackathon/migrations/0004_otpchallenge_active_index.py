@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0003_authsession_binary_token_hash'),
+    ]
+
+    operations = [
+        # Add first: the member FK always keeps an index with member_id as its leftmost column.
+        migrations.AddIndex(
+            model_name='otpchallenge',
+            index=models.Index(
+                fields=['member', 'identifier', 'consumed_at', 'expires_at'],
+                name='otp_active_lookup',
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name='otpchallenge',
+            name='hackathon_o_member__3c5c05_idx',
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+from ._gameresults import gameresults_exists
+
+# status, attempts_used and secret_word only lived inside the game_session_data text blob, so
+# every stats view decoded it per row. gameresults is unmanaged, so the columns are raw DDL
+# (online, like the gameresults indexes) and GameResult declares them by hand.
+ADD_COLUMNS_SQL = (
+    'ALTER TABLE gameresults '
+    'ADD COLUMN status VARCHAR(16) NULL, '
+    'ADD COLUMN attempts_used SMALLINT NULL, '
+    'ADD COLUMN secret_word VARCHAR(50) NULL, '
+    'ALGORITHM=INPLACE, LOCK=NONE'
+)
+DROP_COLUMNS_SQL = (
+    'ALTER TABLE gameresults '
+    'DROP COLUMN status, DROP COLUMN attempts_used, DROP COLUMN secret_word'
+)
+
+# Rows that are not valid JSON are skipped (JSON_EXTRACT would fail the whole UPDATE), and
+# values of the wrong JSON type stay NULL rather than tripping strict-mode casts.
+BACKFILL_SQL = '''
+    UPDATE gameresults SET
+        status = CASE WHEN JSON_TYPE(JSON_EXTRACT(game_session_data, '$.status')) = 'STRING'
+            THEN LEFT(JSON_UNQUOTE(JSON_EXTRACT(game_session_data, '$.status')), 16) END,
+        attempts_used = CASE WHEN JSON_TYPE(JSON_EXTRACT(game_session_data, '$.attempts_used')) = 'INTEGER'
+            AND JSON_EXTRACT(game_session_data, '$.attempts_used') BETWEEN 0 AND 32767
+            THEN JSON_EXTRACT(game_session_data, '$.attempts_used') END,
+        secret_word = CASE WHEN JSON_TYPE(JSON_EXTRACT(game_session_data, '$.secret_word')) = 'STRING'
+            THEN LEFT(JSON_UNQUOTE(JSON_EXTRACT(game_session_data, '$.secret_word')), 50) END
+    WHERE result_id > %s AND result_id <= %s AND JSON_VALID(game_session_data)
+'''
+BATCH_SIZE = 5000
+
+
+def add_columns(apps, schema_editor):
+    if not gameresults_exists(schema_editor):
+        return
+    schema_editor.execute(ADD_COLUMNS_SQL)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(result_id), 0) FROM gameresults')
+        (max_id,) = cursor.fetchone()
+        # Primary-key ranges keep each UPDATE's row locks short.
+        for low in range(0, max_id, BATCH_SIZE):
+            cursor.execute(BACKFILL_SQL, [low, low + BATCH_SIZE])
+
+
+def drop_columns(apps, schema_editor):
+    if gameresults_exists(schema_editor):
+        schema_editor.execute(DROP_COLUMNS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0004_otpchallenge_active_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_columns, drop_columns, hints={'model_name': 'gameresult'}),
+    ]
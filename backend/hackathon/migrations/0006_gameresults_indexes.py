@@ -0,0 +1,70 @@
+from django.db import migrations
+
+from ._gameresults import gameresults_exists
+
+# gameresults is an existing, unmanaged MySQL table, so the indexes are raw DDL, built
+# online (the MySQL counterpart of CONCURRENTLY).
+
+# The leaderboard filters status = 'won'. Wins that still have no status (saved by workers
+# that predate 0005's columns, or whose blob could not be read) are marked first, so none
+# drop off the leaderboard; ApiGameCompleteView writes percentage_score '100' exactly for
+# won games.
+BACKFILL_SQL = (
+    "UPDATE gameresults SET status = 'won' "
+    "WHERE result_id > %s AND result_id <= %s AND status IS NULL AND percentage_score = '100'"
+)
+BATCH_SIZE = 5000
+
+# Leaderboard: filter(game_name=..., status='won').order_by('-absolute_score', 'duration',
+# '-created_at'), with the selected columns (player_id, secret_word, attempts_used) trailing
+# the sort keys since MySQL has no INCLUDE, so the top-N read never touches the rows.
+LB_INDEX_NAME = 'gameresults_lb_status_idx'
+CREATE_LB_SQL = (
+    f'CREATE INDEX {LB_INDEX_NAME} ON gameresults '
+    '(game_name, status, absolute_score DESC, duration, created_at DESC, '
+    'player_id, secret_word, attempts_used) '
+    'ALGORITHM=INPLACE LOCK=NONE'
+)
+DROP_LB_SQL = f'DROP INDEX {LB_INDEX_NAME} ON gameresults'
+
+# Per-player stats, analytics and history filter on player_id and game_name and read newest
+# first. History pages by (created_at DESC, result_id DESC); the primary key InnoDB appends
+# is ascending, so result_id is spelled out to match the ORDER BY and the keyset seek.
+PLAYER_INDEX_NAME = 'gameresults_player_hist_idx'
+CREATE_PLAYER_SQL = (
+    f'CREATE INDEX {PLAYER_INDEX_NAME} ON gameresults '
+    '(player_id, game_name, created_at DESC, result_id DESC) '
+    'ALGORITHM=INPLACE LOCK=NONE'
+)
+DROP_PLAYER_SQL = f'DROP INDEX {PLAYER_INDEX_NAME} ON gameresults'
+
+
+def create_indexes(apps, schema_editor):
+    if not gameresults_exists(schema_editor):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(result_id), 0) FROM gameresults')
+        (max_id,) = cursor.fetchone()
+        # Primary-key ranges keep each UPDATE's row locks short.
+        for low in range(0, max_id, BATCH_SIZE):
+            cursor.execute(BACKFILL_SQL, [low, low + BATCH_SIZE])
+    schema_editor.execute(CREATE_LB_SQL)
+    schema_editor.execute(CREATE_PLAYER_SQL)
+
+
+def drop_indexes(apps, schema_editor):
+    # The backfilled statuses are correct either way, so only the indexes are dropped.
+    if gameresults_exists(schema_editor):
+        schema_editor.execute(DROP_PLAYER_SQL)
+        schema_editor.execute(DROP_LB_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0005_gameresults_session_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes, hints={'model_name': 'gameresult'}),
+    ]
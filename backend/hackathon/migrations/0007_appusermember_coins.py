@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+# AppUserMember.coins was only ever added by hand with add_coins_column.sql, so fresh
+# databases (including the test database) lacked it. Databases that ran the script keep
+# their column; the others get it here, and the migration state records it either way.
+
+
+def _has_coins_column(schema_editor, model) -> bool:
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        columns = connection.introspection.get_table_description(cursor, model._meta.db_table)
+    return any(column.name == 'coins' for column in columns)
+
+
+def add_coins(apps, schema_editor):
+    model = apps.get_model('hackathon', 'AppUserMember')
+    if not _has_coins_column(schema_editor, model):
+        schema_editor.add_field(model, model._meta.get_field('coins'))
+
+
+def remove_coins(apps, schema_editor):
+    model = apps.get_model('hackathon', 'AppUserMember')
+    if _has_coins_column(schema_editor, model):
+        schema_editor.remove_field(model, model._meta.get_field('coins'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathon', '0006_gameresults_indexes'),
+    ]
+
+    operations = [
+        # State first, so the RunPython below sees the coins field on the historical model.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='appusermember',
+                    name='coins',
+                    field=models.IntegerField(default=100),
+                ),
+            ],
+        ),
+        migrations.RunPython(add_coins, remove_coins),
+    ]
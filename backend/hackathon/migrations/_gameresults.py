@@ -0,0 +1,10 @@
+"""Helpers for migrations that run raw DDL against the unmanaged gameresults table.
+
+The leading underscore keeps Django's migration loader from treating this as a migration.
+"""
+
+
+def gameresults_exists(schema_editor) -> bool:
+    connection = schema_editor.connection
+    # Test databases never contain the unmanaged table.
+    return connection.vendor == 'mysql' and 'gameresults' in connection.introspection.table_names()
@@ -2,6 +2,16 @@ from django.db import models
 from django.utils import timezone
 
 
+class FixedLengthBinaryField(models.BinaryField):
+    """BinaryField stored as BINARY(max_length) on MySQL so it can carry a unique index"""
+
+    def db_type(self, connection):
+        # Django maps BinaryField to LONGBLOB on MySQL, which cannot be indexed without a prefix.
+        if connection.vendor == 'mysql':
+            return f'binary({self.max_length})'
+        return super().db_type(connection)
+
+
 class AppUser(models.Model):
     team_no = models.PositiveIntegerField(unique=True, null=True, blank=True)
     username = models.CharField(max_length=150, unique=True)
@@ -45,7 +55,7 @@ class AppUserMember(models.Model):
 class AuthSession(models.Model):
     user = models.ForeignKey(AppUser, on_delete=models.CASCADE, related_name='sessions')
     member = models.ForeignKey(AppUserMember, on_delete=models.CASCADE, related_name='sessions', null=True, blank=True)
-    token_hash = models.CharField(max_length=64, unique=True)
+    token_hash = FixedLengthBinaryField(max_length=32, unique=True)
 
     created_at = models.DateTimeField(default=timezone.now)
     expires_at = models.DateTimeField()
@@ -55,6 +65,12 @@ class AuthSession(models.Model):
         indexes = [
             models.Index(fields=['user', 'expires_at']),
             models.Index(fields=['member', 'expires_at']),
+            # MySQL has no INCLUDE clause, so the columns the auth lookup filters on and
+            # joins through are trailing key parts instead.
+            models.Index(
+                fields=['token_hash', 'revoked_at', 'expires_at', 'user', 'member'],
+                name='authsess_tok_covering',
+            ),
         ]
 
     def is_valid(self) -> bool:
@@ -74,7 +90,12 @@ class OtpChallenge(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['identifier', 'expires_at']),
-            models.Index(fields=['member', 'expires_at']),
+            # MySQL has no partial indexes; with consumed_at as an equality key part, the
+            # "retire active challenges" UPDATE on a new OTP request only visits live rows.
+            models.Index(
+                fields=['member', 'identifier', 'consumed_at', 'expires_at'],
+                name='otp_active_lookup',
+            ),
             models.Index(fields=['expires_at']),
         ]
 
@@ -106,25 +127,17 @@ class VocabWord(models.Model):
     def __str__(self) -> str:
         return self.word.upper()
     
+    # Main word, synonyms s1-s5 and antonyms a1-a5, in column order.
+    WORD_FIELDS = ('word', 's1', 's2', 's3', 's4', 's5', 'a1', 'a2', 'a3', 'a4', 'a5')
+
+    @staticmethod
+    def five_letter_words(values) -> frozenset[str]:
+        """Upper-cased 5-letter entries among raw column values (None/blank skipped)"""
+        return frozenset(w for w in (v.strip().upper() for v in values if v) if len(w) == 5)
+
     def get_all_5_letter_words(self):
         """Extract all 5-letter words from word, s1-s5, and a1-a5 columns"""
-        words = set()
-        
-        # Add main word if it's 5 letters
-        if self.word and len(self.word.strip()) == 5:
-            words.add(self.word.strip().upper())
-        
-        # Add s1-s5 words (synonyms)
-        for field in [self.s1, self.s2, self.s3, self.s4, self.s5]:
-            if field and len(field.strip()) == 5:
-                words.add(field.strip().upper())
-        
-        # Add a1-a5 words (antonyms)
-        for field in [self.a1, self.a2, self.a3, self.a4, self.a5]:
-            if field and len(field.strip()) == 5:
-                words.add(field.strip().upper())
-        
-        return list(words)
+        return list(self.five_letter_words(getattr(self, f) for f in self.WORD_FIELDS))
 
 
 class GameResult(models.Model):
@@ -132,7 +145,7 @@ class GameResult(models.Model):
     
     Table columns: result_id, game_id, game_name, player_id, start_time, end_time, 
                    duration, absolute_score, percentage_score, game_session_data, 
-                   words_played, created_at
+                   words_played, created_at, status, attempts_used, secret_word
     """
     # Map to existing columns - result_id is the primary key
     result_id = models.AutoField(primary_key=True, db_column='result_id')
@@ -154,6 +167,12 @@ class GameResult(models.Model):
     # Store game state as JSON
     game_session_data = models.TextField(null=True, blank=True, db_column='game_session_data')
     
+    # Copied out of game_session_data (migration 0005) so views can filter/aggregate in SQL.
+    # NULL on rows whose blob was missing, not JSON, or lacked the key.
+    status = models.CharField(max_length=16, null=True, blank=True, db_column='status')
+    attempts_used = models.SmallIntegerField(null=True, blank=True, db_column='attempts_used')
+    secret_word = models.CharField(max_length=50, null=True, blank=True, db_column='secret_word')
+    
     # Words played - this is INTEGER count of words, not the word itself
     words_played = models.IntegerField(default=0, null=True, blank=True, db_column='words_played')
     
@@ -1,22 +1,72 @@
+import base64
+import hashlib
 import json
 from datetime import timedelta
-from django.test import TestCase, Client
+from io import StringIO
+from unittest import mock
+import requests
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, Client, override_settings
 from django.utils import timezone
-from django.urls import reverse
+from django.urls import URLResolver, include, path, reverse
+from django.urls.resolvers import RegexPattern
+from rest_framework.permissions import IsAuthenticated
 from .models import AppUser, AppUserMember, AuthSession, VocabWord, GameResult
-from .auth import hash_password, create_session_token
+from .views import ApiGameGuessView, HealthView
+from . import views
+from .middleware import _exact_routes
+from .auth import _SESSION_CACHE, hash_password, verify_password, create_session_token, hash_session_token
+
+
+def _create_member_session(username, member_name, *, expires_in=timedelta(days=7), **member_fields):
+    """Create an active team with one member and a bearer token for them; returns (member, token)"""
+    salt, hash_val, iterations = hash_password('testpass123')
+    user = AppUser.objects.create(
+        username=username,
+        password_salt_b64=salt,
+        password_hash_b64=hash_val,
+        password_iterations=iterations,
+        is_active=True
+    )
+    member = AppUserMember.objects.create(user=user, name=member_name, **member_fields)
+    token = create_session_token()
+    AuthSession.objects.create(
+        user=user,
+        member=member,
+        token_hash=hash_session_token(token),
+        expires_at=timezone.now() + expires_in
+    )
+    return member, token
+
+
+class GameResultTableMixin:
+    """Create the unmanaged gameresults table in the test database"""
+    
+    @classmethod
+    def setUpClass(cls):
+        # Migrations skip unmanaged models; build the table before the class transaction opens
+        with connection.schema_editor() as editor:
+            editor.create_model(GameResult)
+        super().setUpClass()
+    
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(GameResult)
 
 
 class AuthenticationTestCase(TestCase):
     """Test authentication and authorization functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class"""
         # Create test user
         salt, hash_val, iterations = hash_password('testpass123')
-        self.user = AppUser.objects.create(
+        cls.user = AppUser.objects.create(
             team_no=99,
             username='testteam',
             email='test@example.com',
@@ -28,14 +78,32 @@ class AuthenticationTestCase(TestCase):
         )
         
         # Create test member
-        self.member = AppUserMember.objects.create(
-            user=self.user,
+        cls.member = AppUserMember.objects.create(
+            user=cls.user,
             member_id='TEST001',
             name='Test User',
             email='testuser@example.com',
             phone='+9876543210'
         )
     
+    def setUp(self):
+        """Start each test with empty session caches"""
+        _SESSION_CACHE.clear()
+        cache.clear()
+    
+    def _create_session(self):
+        token = create_session_token()
+        AuthSession.objects.create(
+            user=self.user,
+            member=self.member,
+            token_hash=hash_session_token(token),
+            expires_at=timezone.now() + timedelta(days=7)
+        )
+        return token
+    
+    def _me(self, token):
+        return self.client.get(reverse('api_me'), HTTP_AUTHORIZATION=f'Bearer {token}')
+    
     def test_login_success(self):
         """Test successful login"""
         response = self.client.post(
@@ -85,19 +153,7 @@ class AuthenticationTestCase(TestCase):
     
     def test_me_authenticated(self):
         """Test /api/me endpoint with valid token"""
-        # Create session token
-        token = create_session_token()
-        session = AuthSession.objects.create(
-            user=self.user,
-            member=self.member,
-            token_hash=token['hash'],
-            expires_at=timezone.now() + timedelta(days=7)
-        )
-        
-        response = self.client.get(
-            reverse('api_me'),
-            HTTP_AUTHORIZATION=f'Bearer {token["token"]}'
-        )
+        response = self._me(self._create_session())
         
         self.assertEqual(response.status_code, 200)
         data = response.json()
@@ -112,25 +168,44 @@ class AuthenticationTestCase(TestCase):
     
     def test_logout(self):
         """Test logout functionality"""
-        # Create session token
-        token = create_session_token()
-        session = AuthSession.objects.create(
-            user=self.user,
-            member=self.member,
-            token_hash=token['hash'],
-            expires_at=timezone.now() + timedelta(days=7)
-        )
+        token = self._create_session()
+        self.assertEqual(self._me(token).status_code, 200)
         
         response = self.client.post(
             reverse('api_logout'),
-            HTTP_AUTHORIZATION=f'Bearer {token["token"]}'
+            HTTP_AUTHORIZATION=f'Bearer {token}'
         )
         
         self.assertEqual(response.status_code, 200)
         
-        # Verify session is revoked
-        session.refresh_from_db()
+        # Verify session is revoked and the token stops working at once
+        session = AuthSession.objects.get(token_hash=hash_session_token(token))
         self.assertIsNotNone(session.revoked_at)
+        self.assertEqual(self._me(token).status_code, 401)
+    
+    def test_revoke_in_other_worker(self):
+        """Test a revoke that never reached this process's cache still takes effect"""
+        token = self._create_session()
+        self.assertEqual(self._me(token).status_code, 200)
+        
+        # Another worker's logout updates the row but cannot touch this process's cache
+        AuthSession.objects.filter(token_hash=hash_session_token(token)).update(revoked_at=timezone.now())
+        
+        self.assertEqual(self._me(token).status_code, 401)
+    
+    @override_settings(AUTH_SESSION_CACHE_ALIAS='default')
+    def test_shared_cache_logout_and_deactivation(self):
+        """Test the shared session cache drops entries on logout and deactivation"""
+        token = self._create_session()
+        self.assertEqual(self._me(token).status_code, 200)
+        self.client.post(reverse('api_logout'), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self._me(token).status_code, 401)
+        
+        token = self._create_session()
+        self.assertEqual(self._me(token).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self._me(token).status_code, 401)
 
 
 class GameFlowTestCase(TestCase):
@@ -188,6 +263,14 @@ class GameFlowTestCase(TestCase):
         self.assertEqual(response.status_code, 400)
         data = response.json()
         self.assertIn('error', data)
+    
+    def test_generate_feedback_repeated_letters(self):
+        """Test each secret letter is credited at most once, exact matches first"""
+        feedback = ApiGameGuessView()._generate_feedback
+        
+        self.assertEqual(feedback('LLAMA', 'HELLO'), ['present', 'present', 'absent', 'absent', 'absent'])
+        self.assertEqual(feedback('EERIE', 'THERE'), ['present', 'absent', 'present', 'absent', 'correct'])
+        self.assertEqual(feedback('APPLE', 'APPLE'), ['correct'] * 5)
 
 
 class GameResultTestCase(TestCase):
@@ -252,14 +335,14 @@ class GameResultTestCase(TestCase):
         self.assertEqual(response.status_code, 400)
 
 
-class LeaderboardTestCase(TestCase):
+class LeaderboardTestCase(GameResultTableMixin, TestCase):
     """Test leaderboard functionality"""
     
-    databases = {'default', 'student'}
-    
     def setUp(self):
         """Set up test data"""
         self.client = Client()
+        # Cached bodies outlive each test's rolled-back rows
+        cache.clear()
     
     def test_leaderboard_access(self):
         """Test accessing leaderboard (no auth required)"""
@@ -278,11 +361,97 @@ class LeaderboardTestCase(TestCase):
         data = response.json()
         self.assertLessEqual(len(data['leaderboard']), 5)
 
+    def test_leaderboard_not_modified(self):
+        """Test leaderboard honours If-None-Match with its ETag"""
+        response = self.client.get(reverse('api_leaderboard'))
+        self.assertIn('ETag', response)
 
-class PerformanceAnalyticsTestCase(TestCase):
-    """Test performance analytics functionality"""
+        response = self.client.get(reverse('api_leaderboard'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_leaderboard_win_invalidates_etag(self):
+        """Test recording a win retires the cached leaderboard and its ETag"""
+        etag = self.client.get(reverse('api_leaderboard'))['ETag']
+        
+        response = self.client.post(
+            reverse('api_game_complete'),
+            json.dumps({
+                'secret_word': 'apple',
+                'status': 'won',
+                'attempts_used': 3,
+                'time_taken': 45,
+                'score': 14,
+                'player_name': 'Test Player'
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        
+        response = self.client.get(reverse('api_leaderboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([e['player_name'] for e in response.json()['leaderboard']], ['Test Player'])
     
-    databases = {'default', 'student'}
+    def test_leaderboard_sees_win_from_other_worker(self):
+        """Test a win saved without touching this process's cache still retires the ETag"""
+        etag = self.client.get(reverse('api_leaderboard'))['ETag']
+        
+        # Another worker's save never reaches this worker's local-memory cache
+        GameResult.objects.create(player_id='Other Player', start_time=timezone.now(), status='won', absolute_score=9)
+        
+        response = self.client.get(reverse('api_leaderboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e['player_name'] for e in response.json()['leaderboard']], ['Other Player'])
+
+
+class GameHistoryTestCase(GameResultTableMixin, TestCase):
+    """Test game history pagination"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a player with three games, two sharing a timestamp"""
+        _, cls.token = _create_member_session('historyteam', 'History User')
+        
+        now = timezone.now()
+        cls.result_ids = [
+            GameResult.objects.create(
+                player_id='History User',
+                start_time=created_at,
+                status='won',
+                secret_word=word,
+                created_at=created_at
+            ).result_id
+            for word, created_at in [('apple', now), ('bread', now), ('chart', now - timedelta(minutes=1))]
+        ]
+    
+    def _history(self, query):
+        return self.client.get(reverse('api_game_history') + query, HTTP_AUTHORIZATION=f'Bearer {self.token}')
+    
+    def test_history_follows_cursor(self):
+        """Test next_cursor pages through every game once, even pasted unencoded into the URL"""
+        response = self._history('?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertTrue(first['has_more'])
+        
+        response = self._history(f"?page_size=2&cursor={first['next_cursor']}")
+        self.assertEqual(response.status_code, 200)
+        second = response.json()
+        self.assertFalse(second['has_more'])
+        self.assertIsNone(second['next_cursor'])
+        
+        round_ids = [game['round_id'] for game in first['games'] + second['games']]
+        self.assertEqual(round_ids, [self.result_ids[1], self.result_ids[0], self.result_ids[2]])
+    
+    def test_history_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        response = self._history('?cursor=2024-01-01T00:00:00 00:00_1')
+        
+        self.assertEqual(response.status_code, 400)
+
+
+class PerformanceAnalyticsTestCase(GameResultTableMixin, TestCase):
+    """Test performance analytics functionality"""
     
     def setUp(self):
         """Set up test data"""
@@ -301,6 +470,28 @@ class PerformanceAnalyticsTestCase(TestCase):
         self.assertIn('win_rate', data)
         self.assertIn('avg_score', data)
     
+    def test_analytics_counts_wins_by_status(self):
+        """Test a win is decided by status, not percentage_score"""
+        now = timezone.now()
+        for status, percentage_score in [('won', '0'), ('lost', '100'), ('won', '100')]:
+            GameResult.objects.create(
+                player_id='Test Player',
+                start_time=now,
+                status=status,
+                percentage_score=percentage_score,
+                attempts_used=3
+            )
+        
+        response = self.client.get(
+            reverse('api_performance_analytics') + '?player_name=Test%20Player'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['total_wins'], 2)
+        self.assertEqual(data['total_losses'], 1)
+        self.assertEqual(data['attempts_distribution']['3'], 2)
+    
     def test_analytics_no_player_name(self):
         """Test analytics without player name"""
         response = self.client.get(reverse('api_performance_analytics'))
@@ -308,13 +499,81 @@ class PerformanceAnalyticsTestCase(TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+class WordMeaningTestCase(TestCase):
+    """Test dictionary lookups and their fallback"""
+    
+    def setUp(self):
+        """Start each test with empty caches and no backoff"""
+        cache.clear()
+        views._word_meaning.cache_clear()
+        views._dictionary_retry_at = 0.0
+    
+    def _meaning(self, word):
+        return self.client.get(reverse('api_word_meaning') + f'?word={word}').json()
+    
+    def _entry(self, definition):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = [{'meanings': [
+            {'partOfSpeech': 'noun', 'definitions': [{'definition': definition}]}
+        ]}]
+        return response
+    
+    def test_bad_response_falls_back_for_that_word_only(self):
+        """Test an upstream 5xx does not back off lookups for other words"""
+        error = mock.Mock(status_code=503)
+        error.raise_for_status.side_effect = requests.HTTPError('503 Server Error')
+        
+        with mock.patch.object(views._DICTIONARY_HTTP, 'get', side_effect=[error, self._entry('A fruit.')]):
+            self.assertEqual(self._meaning('apple')['parts_of_speech'], [])
+            self.assertEqual(self._meaning('mango')['meaning'], 'Noun: A fruit.')
+    
+    def test_connection_error_backs_off(self):
+        """Test an unreachable API answers later misses with the fallback without retrying"""
+        with mock.patch.object(views._DICTIONARY_HTTP, 'get', side_effect=requests.ConnectionError) as get:
+            self.assertEqual(self._meaning('apple')['parts_of_speech'], [])
+            self.assertEqual(self._meaning('mango')['parts_of_speech'], [])
+        
+        self.assertEqual(get.call_count, 1)
+
+
+class HintTestCase(TestCase):
+    """Test coin spending on hints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a member with enough coins for exactly one hint"""
+        cls.member, cls.token = _create_member_session('hintteam', 'Hint User', coins=15)
+
+    def _request_hint(self):
+        return self.client.post(
+            reverse('api_hint'),
+            json.dumps({'secret_word': 'APPLE', 'revealed_positions': [0]}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {self.token}'
+        )
+
+    def test_hint_spends_coins(self):
+        """Test a hint deducts its cost and reports the new balance"""
+        response = self._request_hint()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['remaining_coins'], 5)
+
+        # The second hint is refused without going negative
+        response = self._request_hint()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['available'], 5)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.coins, 5)
+
+
 class ModelTestCase(TestCase):
     """Test model functionality"""
     
-    def setUp(self):
-        """Set up test data"""
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class"""
         salt, hash_val, iterations = hash_password('testpass')
-        self.user = AppUser.objects.create(
+        cls.user = AppUser.objects.create(
             team_no=1,
             username='team1',
             email='team1@test.com',
@@ -381,6 +640,58 @@ class ModelTestCase(TestCase):
         self.assertFalse(session.is_valid())
 
 
+class PruneSessionsTestCase(TestCase):
+    """Test the prune_sessions management command"""
+    
+    def test_prune_sessions_batches(self):
+        """Test only long-dead sessions are deleted, across several batches"""
+        salt, hash_val, iterations = hash_password('testpass')
+        user = AppUser.objects.create(
+            username='pruneteam',
+            password_salt_b64=salt,
+            password_hash_b64=hash_val,
+            password_iterations=iterations
+        )
+        now = timezone.now()
+        old = now - timedelta(days=30)
+        for expires_at, revoked_at in [(old, None), (now + timedelta(days=1), None), (now, old), (old, None), (now, now)]:
+            AuthSession.objects.create(
+                user=user,
+                token_hash=hash_session_token(create_session_token()),
+                expires_at=expires_at,
+                revoked_at=revoked_at
+            )
+        
+        call_command('prune_sessions', batch_size=1, stdout=StringIO())
+        
+        self.assertEqual(AuthSession.objects.count(), 2)
+
+
+class PasswordHashingTestCase(TestCase):
+    """Test PBKDF2 password hashing"""
+    
+    def test_hash_matches_openssl_pbkdf2(self):
+        """Test hash_password produces standard PBKDF2-HMAC-SHA256 output"""
+        salt, hash_val, iterations = hash_password('testpass', iterations=1000)
+        expected = hashlib.pbkdf2_hmac('sha256', b'testpass', base64.b64decode(salt), 1000, 32)
+        
+        self.assertEqual(iterations, 1000)
+        self.assertEqual(base64.b64decode(hash_val), expected)
+    
+    def test_verify_password(self):
+        """Test password verification accepts only the original password"""
+        salt, hash_val, iterations = hash_password('testpass', iterations=1000)
+        
+        self.assertTrue(verify_password('testpass', salt_b64=salt, password_hash_b64=hash_val, iterations=iterations))
+        self.assertFalse(verify_password('wrongpass', salt_b64=salt, password_hash_b64=hash_val, iterations=iterations))
+    
+    def test_session_token_hash_is_plain_sha256(self):
+        """Test session tokens are hashed with one SHA-256, not the password KDF"""
+        token = create_session_token()
+        
+        self.assertEqual(hash_session_token(token), hashlib.sha256(token.encode('utf-8')).digest())
+
+
 class HealthCheckTestCase(TestCase):
     """Test health check endpoint"""
     
@@ -393,23 +704,33 @@ class HealthCheckTestCase(TestCase):
         self.assertIn('status', data)
         self.assertEqual(data['status'], 'ok')
 
+    def test_health_check_enforces_permissions(self):
+        """Test skipping content negotiation still runs permission checks"""
+        with mock.patch.object(HealthView, 'permission_classes', [IsAuthenticated]):
+            response = self.client.get(reverse('health'))
+        
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('detail', response.json())
+
+
+class ExactPathDispatchTestCase(SimpleTestCase):
+    """Test which routes ExactPathDispatchMiddleware may call directly"""
+    
+    def test_routes_with_extra_kwargs_are_not_dispatched(self):
+        """Test extra view kwargs keep their routes on the normal resolver"""
+        view = HealthView.as_view()
+        resolver = URLResolver(RegexPattern(r'^/'), [
+            path('plain', view),
+            path('kwargs', view, {'k': 'v'}),
+            path('nested/', include([path('inner', view)]), {'k': 'v'}),
+        ])
+        
+        self.assertEqual(list(_exact_routes(resolver)), ['/plain'])
+
 
 class SecurityTestCase(TestCase):
     """Test security features"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        salt, hash_val, iterations = hash_password('testpass123')
-        self.user = AppUser.objects.create(
-            team_no=99,
-            username='testteam',
-            password_salt_b64=salt,
-            password_hash_b64=hash_val,
-            password_iterations=iterations,
-            is_active=True
-        )
-    
     def test_invalid_token_format(self):
         """Test request with invalid token format"""
         response = self.client.get(
@@ -421,16 +742,11 @@ class SecurityTestCase(TestCase):
     
     def test_expired_token(self):
         """Test request with expired token"""
-        token = create_session_token()
-        session = AuthSession.objects.create(
-            user=self.user,
-            token_hash=token['hash'],
-            expires_at=timezone.now() - timedelta(days=1)
-        )
+        _, token = _create_member_session('testteam', 'Test User', expires_in=-timedelta(days=1))
         
         response = self.client.get(
             reverse('api_me'),
-            HTTP_AUTHORIZATION=f'Bearer {token["token"]}'
+            HTTP_AUTHORIZATION=f'Bearer {token}'
         )
         
         self.assertEqual(response.status_code, 401)
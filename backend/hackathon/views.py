@@ -1,8 +1,15 @@
-import json
+import hashlib
+import logging
 import re
 import random
-from datetime import timedelta
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 # Initialize WordNet-based word checker (much more comprehensive than basic words corpus)
 try:
@@ -16,6 +23,8 @@ try:
         print("[INFO] Downloading WordNet corpus...")
         nltk.download('wordnet', quiet=True)
         nltk.download('omw-1.4', quiet=True)  # Open Multilingual WordNet for better coverage
+        # download() only reports failures; look again so an offline boot disables the checker
+        nltk.data.find('corpora/wordnet')
     
     WORD_CHECKER_AVAILABLE = True
     print("[INFO] WordNet word checker initialized successfully")
@@ -23,18 +32,31 @@ except Exception as e:
     print(f"[WARNING] WordNet checker not available: {e}")
     WORD_CHECKER_AVAILABLE = False
 
-from django.http import HttpRequest, JsonResponse
-from django.db import transaction, connections
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views import View
-from django.db.models import Sum, Avg, Count, Q
+from django.db.models import F, Sum, Count, Max, Min, Q
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework import status
-from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+if getattr(settings, 'ENABLE_SWAGGER', False):
+    from drf_yasg.utils import swagger_auto_schema
+else:
+    def swagger_auto_schema(**kwargs):
+        # The openapi trees passed in are dropped here instead of living on every view method.
+        return lambda view_method: view_method
+
 from .auth import (
+    burn_password_check,
     create_session_token,
     OtpDispatchError,
     OtpVerifyError,
@@ -42,6 +64,15 @@ from .auth import (
     hash_session_token,
     hash_password,
     dispatch_otp,
+    otp_challenge_consume,
+    otp_challenge_create,
+    otp_challenge_get,
+    otp_challenges_shared,
+    session_cache_get,
+    session_cache_pop,
+    SESSION_CACHE_MISS,
+    session_cache_put,
+    session_cache_put_invalid,
     verify_otp_via_gateway,
     verify_password,
 )
@@ -49,9 +80,54 @@ from .models import AppUser, AppUserMember, AuthSession, OtpChallenge, VocabWord
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(data) -> bytes:
+    # orjson has no Decimal/UUID/lazy-string support; borrow Django's encoder for those.
+    # Non-str keys (e.g. attempts_distribution's ints) are stringified like the stdlib does.
+    return orjson.dumps(
+        data,
+        default=DjangoJSONEncoder().default,
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+_json_loads = orjson.loads
+
+
+class JsonResponse(HttpResponse):
+    """Stand-in for django.http.JsonResponse that encodes with orjson."""
+
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=_json_dumps(data), **kwargs)
+
+
+class _JsonAPIView(APIView):
+    """APIView for handlers that always return a pre-encoded JsonResponse/HttpResponse.
+
+    Keeps the class visible to drf_yasg and runs the rest of APIView.initial (versioning,
+    authentication, permissions, throttling), but skips content negotiation: no renderer is
+    used for the view's own responses.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # finalize_response forces negotiation for DRF Responses (e.g. a denied permission
+        # or throttle), so those still get a renderer.
+        if force:
+            return super().perform_content_negotiation(request, force=True)
+        return None, None
+
+
+_NON_DIGIT_RE = re.compile(r'\D+')
+
 
 def _normalize_phone(raw: str) -> str:
-    return re.sub(r'\D+', '', (raw or '').strip())
+    # Surrounding whitespace is non-digit too, so no separate strip() is needed.
+    return _NON_DIGIT_RE.sub('', raw or '')
 
 
 def _get_bearer_token(request: HttpRequest) -> str | None:
@@ -67,29 +143,184 @@ def _get_bearer_token(request: HttpRequest) -> str | None:
     return token or None
 
 
+_SESSION_FIELDS = (
+    'token_hash', 'revoked_at', 'expires_at', 'user', 'member',
+    'user__username', 'user__team_no', 'user__is_active',
+    'member__user', 'member__member_id', 'member__name', 'member__email', 'member__phone', 'member__coins',
+)
+
+
 def _get_session(request: HttpRequest) -> AuthSession | None:
     token = _get_bearer_token(request)
     if not token:
         return None
 
     token_hash = hash_session_token(token)
-    return (
-        AuthSession.objects.select_related('user', 'member')
-        .filter(token_hash=token_hash, revoked_at__isnull=True, expires_at__gt=timezone.now())
-        .first()
-    )
+    session = session_cache_get(token_hash)
+    if session is not SESSION_CACHE_MISS:
+        return session
+
+    # One JOIN for session, user and member. get() rather than first(): token_hash is unique,
+    # so first()'s implicit ORDER BY id is wasted work on every authenticated request.
+    # Only the columns views read: the session side stays inside authsess_tok_covering, and
+    # the password salt/hash never leave the database (or land in the session cache).
+    try:
+        session = (
+            AuthSession.objects
+            .select_related('user', 'member')
+            .only(*_SESSION_FIELDS)
+            .get(token_hash=token_hash, revoked_at__isnull=True, expires_at__gt=timezone.now())
+        )
+    except AuthSession.DoesNotExist:
+        session = None
+    if session is None:
+        session_cache_put_invalid(token_hash)
+    else:
+        session_cache_put(token_hash, session, expires_at=session.expires_at)
+    return session
+
+
+@receiver(post_save, sender=AppUser)
+def _drop_deactivated_user_sessions(instance: AppUser, **kwargs) -> None:
+    # Cached sessions carry user.is_active; a deactivated team must not ride on them until
+    # SESSION_CACHE_TTL runs out.
+    if instance.is_active:
+        return
+    live_hashes = AuthSession.objects.filter(
+        user=instance, revoked_at__isnull=True, expires_at__gt=timezone.now()
+    ).values_list('token_hash', flat=True)
+    for token_hash in live_hashes:
+        session_cache_pop(bytes(token_hash))
+
+
+def _load_five_letter_vocab() -> tuple[int, frozenset[str]]:
+    # Raw column tuples, streamed: no VocabWord instances are built for the full-table scan.
+    rows = VocabWord.objects.values_list(*VocabWord.WORD_FIELDS).iterator(chunk_size=2000)
+    row_count = 0
+
+    def column_values():
+        nonlocal row_count
+        for values in rows:
+            row_count += 1
+            yield from values
+
+    # One set comprehension over every column of every row, instead of a set per row plus a union.
+    words = VocabWord.five_letter_words(column_values())
+    return row_count, words
+
+
+# lsm_vocab1 only changes through populate_words/admin, so a few minutes of staleness is fine.
+VOCAB_CACHE_TTL_SECONDS = 300
+_VOCAB_CACHE: tuple[float, int, tuple[str, ...], frozenset[str]] | None = None
+_VOCAB_CACHE_LOCK = threading.Lock()
+
+
+def _five_letter_vocab() -> tuple[int, tuple[str, ...], frozenset[str]]:
+    global _VOCAB_CACHE
+    cached = _VOCAB_CACHE
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1:]
+
+    # One scan per expiry: threads that missed together wait for the first one's result.
+    with _VOCAB_CACHE_LOCK:
+        now = time.monotonic()
+        cached = _VOCAB_CACHE
+        if cached is not None and cached[0] > now:
+            return cached[1:]
+
+        row_count, words = _load_five_letter_vocab()
+        # The frozenset is cached as built; only the tuple random.choice indexes is a copy.
+        entry = (now + VOCAB_CACHE_TTL_SECONDS, row_count, tuple(words), words)
+        # Never pin an empty vocabulary: an admin may be populating it right now.
+        if words:
+            _VOCAB_CACHE = entry
+        return entry[1:]
+
+
+@receiver(post_save, sender=VocabWord)
+@receiver(post_delete, sender=VocabWord)
+def _invalidate_vocab_cache(**kwargs) -> None:
+    global _VOCAB_CACHE
+    _VOCAB_CACHE = None
+
+
+@lru_cache(maxsize=32768)
+def _in_wordnet(word: str) -> bool:
+    # synsets() runs morphy over every part of speech; players retry the same words a lot,
+    # and WordNet itself never changes while the process runs.
+    return bool(wordnet.synsets(word))
 
 
 def _json_body(request: HttpRequest) -> dict:
     if not request.body:
         return {}
     try:
-        return json.loads(request.body.decode('utf-8'))
-    except json.JSONDecodeError:
+        return _json_loads(request.body)
+    except ValueError:
         return {}
 
 
-class HealthView(APIView):
+def _spend_coins(member_id: int, amount: int) -> tuple[bool, int]:
+    """Deduct ``amount`` coins in one guarded UPDATE; returns (spent, balance)."""
+    members = AppUserMember.objects.filter(id=member_id)
+    spent = members.filter(coins__gte=amount).update(coins=F('coins') - amount) == 1
+    return spent, members.values_list('coins', flat=True).get()
+
+
+# Only bounds how long an admin edit or delete of an existing win can go unseen; new wins
+# change the cache key at once.
+LEADERBOARD_CACHE_TTL_SECONDS = 60
+
+
+def _won_games():
+    # Filter for won Bulls and Bears games only, so every fetched row is ranked.
+    return GameResult.objects.filter(game_name='Bulls and Bears', status='won')
+
+
+def _leaderboard_cache_key(limit: int) -> str:
+    # Keyed on the newest win, read from the database rather than a cache-held generation:
+    # without Redis each worker has its own cache, and a win recorded in one worker must
+    # still retire the board everywhere. The leaderboard index covers (game_name, status)
+    # and carries result_id as its primary-key suffix, so this never touches the rows.
+    latest_win = _won_games().aggregate(latest=Max('result_id'))['latest']
+    return f'lb:{latest_win or 0}:{limit}'
+
+
+def _leaderboard_entries(limit: int) -> Iterator[dict]:
+    # Get top game results sorted by score (descending), then by duration (ascending)
+    leaderboard_results = (
+        _won_games()
+        .order_by('-absolute_score', 'duration', '-created_at')
+        # Plain tuples straight into the entry dicts: no model instances, and no
+        # game_session_data — player_id is the player name and the rest has its own column.
+        .values_list('player_id', 'absolute_score', 'duration', 'created_at', 'secret_word', 'attempts_used')[:limit]
+        .iterator(chunk_size=200)
+    )
+    
+    for rank, (player_id, absolute_score, duration, created_at, secret_word, attempts_used) in enumerate(leaderboard_results, start=1):
+        yield {
+            'rank': rank,
+            'player_name': player_id or 'Anonymous',
+            'score': round(absolute_score, 2),
+            'secret_word': (secret_word or 'XXXXX').upper(),
+            'attempts_used': attempts_used or 0,
+            'time_taken': round(duration, 2) if duration else 0.0,
+            'created_at': created_at.isoformat()
+        }
+
+
+def _leaderboard_body(limit: int) -> bytes:
+    # Each entry is encoded as the rows stream in, so up to `limit` dicts are never alive at
+    # once; the body still has to be whole for the ETag and the cache.
+    entries = b','.join(_json_dumps(entry) for entry in _leaderboard_entries(limit))
+    return b'{"leaderboard":[' + entries + b']}'
+
+
+# Liveness probes hit this constantly; serialize once instead of per request.
+_HEALTH_BODY = _json_dumps({'status': 'ok'})
+
+
+class HealthView(_JsonAPIView):
     """Health check endpoint"""
     
     @swagger_auto_schema(
@@ -101,7 +332,7 @@ class HealthView(APIView):
         ))}
     )
     def get(self, request):
-        return Response({'status': 'ok'})
+        return HttpResponse(_HEALTH_BODY, content_type='application/json')
 
 
 class ApiLoginView(APIView):
@@ -150,18 +381,24 @@ class ApiLoginView(APIView):
 
         members = list(members_qs)
         if not members:
+            burn_password_check(password)
             return JsonResponse({'error': 'Invalid username or password.'}, status=401)
 
         matched_user: AppUser | None = None
         matched_member: AppUserMember | None = None
+        # The password belongs to the team, and an email can match several members of one
+        # team, so run PBKDF2 once per team rather than once per member.
+        verified: dict[int, bool] = {}
         for member in members:
             user = member.user
-            if verify_password(
-                password,
-                salt_b64=user.password_salt_b64,
-                password_hash_b64=user.password_hash_b64,
-                iterations=user.password_iterations,
-            ):
+            if user.id not in verified:
+                verified[user.id] = verify_password(
+                    password,
+                    salt_b64=user.password_salt_b64,
+                    password_hash_b64=user.password_hash_b64,
+                    iterations=user.password_iterations,
+                )
+            if verified[user.id]:
                 matched_user = user
                 matched_member = member
                 break
@@ -260,27 +497,36 @@ class ApiRegisterView(APIView):
         if len(password) < 6:
             return JsonResponse({'error': 'Password must be at least 6 characters long.'}, status=400)
 
+        # PBKDF2 is by far the slowest step; keep it out of the transaction
+        salt_b64, password_hash_b64, iterations = hash_password(password)
+
         try:
             with transaction.atomic():
-                # Check if user already exists
-                if AppUser.objects.filter(email=email).exists():
-                    return JsonResponse({'error': 'Email already registered.'}, status=409)
+                # Generate username from email
+                base_username = email.split('@')[0]
+                
+                # One query answers both "is the email taken" and "which usernames are taken"
+                taken_usernames = set()
+                for existing_username, existing_email in (
+                    AppUser.objects
+                    .filter(Q(email=email) | Q(username__istartswith=base_username))
+                    .values_list('username', 'email')
+                ):
+                    # email is lowercased; match the stored one the way MySQL's collation does
+                    if (existing_email or '').lower() == email:
+                        return JsonResponse({'error': 'Email already registered.'}, status=409)
+                    taken_usernames.add(existing_username.lower())
                 
                 if AppUserMember.objects.filter(phone=phone).exists():
                     return JsonResponse({'error': 'Phone number already registered.'}, status=409)
                 
-                # Generate username from email
-                username = email.split('@')[0]
                 # Ensure username is unique
-                base_username = username
+                username = base_username
                 counter = 1
-                while AppUser.objects.filter(username=username).exists():
+                while username in taken_usernames:
                     username = f"{base_username}{counter}"
                     counter += 1
                 
-                # Hash password
-                salt_b64, password_hash_b64, iterations = hash_password(password)
-                
                 # Create user
                 user = AppUser.objects.create(
                     username=username,
@@ -306,11 +552,14 @@ class ApiRegisterView(APIView):
                     'user_id': user.id
                 }, status=200)
                 
+        except IntegrityError:
+            # A concurrent registration claimed the same email, phone or username
+            return JsonResponse({'error': 'Unable to create account. Please try again.'}, status=409)
         except Exception as e:
             return JsonResponse({'error': 'Unable to create account. Please try again.'}, status=500)
 
 
-class ApiMeView(APIView):
+class ApiMeView(_JsonAPIView):
     """Get current user information"""
     
     @swagger_auto_schema(
@@ -332,19 +581,17 @@ class ApiMeView(APIView):
     )
     def get(self, request):
         session = _get_session(request)
-        print(f"[DEBUG /api/me] Session: {session}")
         
         if session is None or not session.user.is_active:
-            print(f"[DEBUG /api/me] Session is None or user inactive")
+            logger.debug('/api/me: no active session')
             return JsonResponse({'error': 'Unauthorized'}, status=401)
-
-        print(f"[DEBUG /api/me] User: {session.user.username}, Team: {session.user.team_no}")
         
         if session.member is None:
-            print(f"[DEBUG /api/me] Member is None")
+            logger.debug('/api/me: session for team %s has no member', session.user.team_no)
             return JsonResponse({'error': 'Unauthorized'}, status=401)
-
-        print(f"[DEBUG /api/me] Member: {session.member.name}, Email: {session.member.email}")
+        
+        # The cached session snapshot predates any hint spend or win award; re-read the balance
+        session.member.refresh_from_db(fields=['coins'])
         
         response_data = {
             'user': {
@@ -361,7 +608,6 @@ class ApiMeView(APIView):
                 'coins': session.member.coins,
             },
         }
-        print(f"[DEBUG /api/me] Sending response: {response_data}")
         
         return JsonResponse(response_data)
 
@@ -387,9 +633,27 @@ class ApiLogoutView(APIView):
 
         session.revoked_at = timezone.now()
         session.save(update_fields=['revoked_at'])
+        # Backends may hand BinaryField values back as memoryview.
+        session_cache_pop(bytes(session.token_hash))
         return JsonResponse({'ok': True})
 
 
+_OTP_CHANNELS = frozenset({'whatsapp', 'email'})
+# The identifier each channel needs, and the error when it is missing.
+_OTP_IDENTIFIER_ERRORS = {
+    'whatsapp': 'Please enter mobile number.',
+    'email': 'Please enter email id.',
+}
+
+
+def _validate_otp_request(channel: str, phone: str, email: str) -> str | None:
+    if channel not in _OTP_CHANNELS:
+        return 'Invalid OTP channel.'
+    if not (phone if channel == 'whatsapp' else email):
+        return _OTP_IDENTIFIER_ERRORS[channel]
+    return None
+
+
 class ApiOtpRequestView(View):
     OTP_TTL = timedelta(minutes=5)
 
@@ -400,13 +664,9 @@ class ApiOtpRequestView(View):
         email = (payload.get('email') or payload.get('username') or '').strip()
         team_no_raw = payload.get('team_no')
 
-        if channel not in {'whatsapp', 'email'}:
-            return JsonResponse({'error': 'Invalid OTP channel.'}, status=400)
-
-        if channel == 'whatsapp' and not phone:
-            return JsonResponse({'error': 'Please enter mobile number.'}, status=400)
-        if channel == 'email' and not email:
-            return JsonResponse({'error': 'Please enter email id.'}, status=400)
+        error = _validate_otp_request(channel, phone, email)
+        if error:
+            return JsonResponse({'error': error}, status=400)
 
         if channel == 'whatsapp':
             members_qs = (
@@ -460,6 +720,11 @@ class ApiOtpRequestView(View):
         now = timezone.now()
         expires_at = now + self.OTP_TTL
 
+        if otp_challenges_shared():
+            # Supersedes the member's earlier pending challenge for this identifier, as below.
+            challenge_id = otp_challenge_create(member_id=member.id, identifier=identifier, ttl=self.OTP_TTL)
+            return JsonResponse({'challenge_id': challenge_id, 'expires_at': expires_at.isoformat()})
+
         with transaction.atomic():
             OtpChallenge.objects.filter(
                 member=member,
@@ -487,21 +752,34 @@ class ApiOtpVerifyView(View):
         if not challenge_id or not otp:
             return JsonResponse({'error': 'Please enter OTP.'}, status=400)
 
-        try:
-            challenge_id_int = int(challenge_id)
-        except (TypeError, ValueError):
-            return JsonResponse({'error': 'Invalid OTP request.'}, status=400)
-
-        challenge = (
-            OtpChallenge.objects.select_related('member', 'member__user')
-            .filter(id=challenge_id_int)
-            .first()
-        )
-        if challenge is None or not challenge.is_valid() or challenge.member is None:
-            return JsonResponse({'error': 'Invalid or expired OTP.'}, status=401)
+        if otp_challenges_shared():
+            if not isinstance(challenge_id, str) or len(challenge_id) > 64:
+                return JsonResponse({'error': 'Invalid OTP request.'}, status=400)
+            cached = otp_challenge_get(challenge_id)
+            member = None
+            if cached is not None:
+                member_id, identifier = cached
+                member = AppUserMember.objects.select_related('user').filter(id=member_id).first()
+            if member is None:
+                return JsonResponse({'error': 'Invalid or expired OTP.'}, status=401)
+        else:
+            try:
+                challenge_id_int = int(challenge_id)
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'Invalid OTP request.'}, status=400)
+
+            challenge = (
+                OtpChallenge.objects.select_related('member', 'member__user')
+                .filter(id=challenge_id_int)
+                .first()
+            )
+            if challenge is None or not challenge.is_valid() or challenge.member is None:
+                return JsonResponse({'error': 'Invalid or expired OTP.'}, status=401)
+            member = challenge.member
+            identifier = challenge.identifier
 
         try:
-            ok = verify_otp_via_gateway(identifier=challenge.identifier, otp=otp)
+            ok = verify_otp_via_gateway(identifier=identifier, otp=otp)
         except OtpVerifyError as exc:
             return JsonResponse({'error': str(exc)}, status=502)
 
@@ -511,11 +789,13 @@ class ApiOtpVerifyView(View):
         now = timezone.now()
 
         with transaction.atomic():
-            updated = OtpChallenge.objects.filter(id=challenge.id, consumed_at__isnull=True).update(consumed_at=now)
-            if updated != 1:
+            if otp_challenges_shared():
+                consumed = otp_challenge_consume(challenge_id)
+            else:
+                consumed = OtpChallenge.objects.filter(id=challenge.id, consumed_at__isnull=True).update(consumed_at=now) == 1
+            if not consumed:
                 return JsonResponse({'error': 'Invalid or expired OTP.'}, status=401)
 
-            member = challenge.member
             user = member.user
 
             raw_token = create_session_token()
@@ -580,25 +860,16 @@ class ApiGameStartView(APIView):
         payload = _json_body(request)
         timer_seconds = payload.get('timer_seconds', 180)  # Default 3 minutes
         
-        # Fetch all vocab words from lsm_vocab1 table
-        vocab_words = list(VocabWord.objects.all())
-        if not vocab_words:
+        # Collect all unique 5-letter words from lsm_vocab1 columns (word, s1-s5, a1-a5)
+        row_count, all_five_letter_words, _ = _five_letter_vocab()
+        if not row_count:
             return JsonResponse({'error': 'No words available. Please contact admin.'}, status=500)
         
-        # Collect all 5-letter words from database columns (word, s1-s5, a1-a5)
-        all_five_letter_words = []
-        for vocab_word in vocab_words:
-            all_five_letter_words.extend(vocab_word.get_all_5_letter_words())
-        
-        # Remove duplicates
-        all_five_letter_words = list(set(all_five_letter_words))
-        
         if not all_five_letter_words:
             return JsonResponse({'error': 'No 5-letter words available. Please contact admin.'}, status=500)
         
         # Pick a random word
         secret_word = random.choice(all_five_letter_words)
-        print(secret_word)
         
         # Return the secret word and game config (frontend will handle all game state)
         return JsonResponse({
@@ -651,23 +922,17 @@ class ApiGameGuessView(APIView):
         
         # Three-tier validation system:
         # 1. First, check if word exists in our database (word, s1-s5, a1-a5)
-        all_vocab_words = VocabWord.objects.all()
-        valid_words_set = set()
-        
-        for vocab_word in all_vocab_words:
-            # Add all 5-letter words from database columns
-            valid_words_set.update(vocab_word.get_all_5_letter_words())
+        _, _, valid_words_set = _five_letter_vocab()
         
         # Check if guess is in our database words
-        in_database = guess.upper() in valid_words_set
+        in_database = guess in valid_words_set
         
         # If not in database, check WordNet (comprehensive English dictionary)
         if not in_database:
             # 2. Check WordNet - much more comprehensive than basic words corpus
             if WORD_CHECKER_AVAILABLE:
                 # WordNet lookup: check if the word exists in WordNet
-                synsets = wordnet.synsets(guess.lower())
-                if not synsets:
+                if not _in_wordnet(guess.lower()):
                     # Word not found in WordNet -> invalid
                     return JsonResponse({'error': 'Invalid word.'}, status=400)
             else:
@@ -676,11 +941,11 @@ class ApiGameGuessView(APIView):
                 return JsonResponse({'error': 'Invalid word.'}, status=400)
         
         # Word is valid (either in database or in WordNet dictionary), proceed with game
-        # Generate feedback
-        feedback = self._generate_feedback(guess, secret_word)
+        # Check if correct: both words are already upper-cased, so this is one string compare
+        is_correct = guess == secret_word
         
-        # Check if correct
-        is_correct = all(f == 'correct' for f in feedback)
+        # Generate feedback (a winning guess needs no letter-by-letter pass)
+        feedback = ['correct'] * 5 if is_correct else self._generate_feedback(guess, secret_word)
         
         return JsonResponse({
             'guess': guess,
@@ -693,24 +958,22 @@ class ApiGameGuessView(APIView):
         Returns list of 'correct', 'present', or 'absent' for each letter
         """
         feedback = ['absent'] * 5
-        secret_letters = list(secret)
+        # Secret letters not matched in place, counted, so 'present' is a dict hit
+        # instead of a list scan per letter.
+        unmatched: dict[str, int] = {}
         
         # First pass: mark correct positions
-        for i in range(5):
-            if guess[i] == secret[i]:
+        for i, (g, c) in enumerate(zip(guess, secret)):
+            if g == c:
                 feedback[i] = 'correct'
-                secret_letters[i] = None  # Mark as used
+            else:
+                unmatched[c] = unmatched.get(c, 0) + 1
         
-        # Second pass: mark present letters
-        for i in range(5):
-            if feedback[i] == 'correct':
-                continue
-            
-            if guess[i] in secret_letters:
+        # Second pass: mark present letters, each unmatched secret letter at most once
+        for i, g in enumerate(guess):
+            if feedback[i] == 'absent' and unmatched.get(g):
                 feedback[i] = 'present'
-                # Remove first occurrence
-                idx = secret_letters.index(guess[i])
-                secret_letters[idx] = None
+                unmatched[g] -= 1
         
         return feedback
 
@@ -767,10 +1030,8 @@ class ApiGameCompleteView(APIView):
         coins_awarded = 0
         if status == 'won' and session and session.member:
             COINS_PER_WIN = 10
-            with transaction.atomic():
-                member = AppUserMember.objects.select_for_update().get(id=session.member.id)
-                member.coins += COINS_PER_WIN
-                member.save(update_fields=['coins'])
+            # Single UPDATE, no row lock held; the rowcount says whether the member still exists
+            if AppUserMember.objects.filter(id=session.member.id).update(coins=F('coins') + COINS_PER_WIN):
                 coins_awarded = COINS_PER_WIN
         
         # Save to gameresults table for leaderboard
@@ -785,7 +1046,12 @@ class ApiGameCompleteView(APIView):
                 duration=int(time_taken),  # Time taken in seconds (integer)
                 absolute_score=int(score),  # Use absolute_score field (integer)
                 percentage_score='100' if status == 'won' else '0',  # VARCHAR field
-                game_session_data=json.dumps({
+                # Queryable copies of the blob's fields; a non-integer attempts_used stays NULL
+                status=status,
+                attempts_used=attempts_used if type(attempts_used) is int and 0 <= attempts_used <= 32767 else None,
+                secret_word=secret_word[:50],
+                # Text column: the orjson bytes are decoded once rather than re-encoded by stdlib json
+                game_session_data=_json_dumps({
                     'player_name': player_name,
                     'secret_word': secret_word,
                     'status': status,
@@ -793,14 +1059,11 @@ class ApiGameCompleteView(APIView):
                     'time_taken': time_taken,
                     'score': score,
                     'completed_at': now.isoformat()
-                }),
+                }).decode('utf-8'),
                 words_played=1,  # Integer count: 1 word played
                 created_at=now
             )
             
-            # Close database connection to prevent connection leaks
-            connections['default'].close()
-            
             response_data = {
                 'ok': True,
                 'message': 'Game result saved successfully!',
@@ -814,24 +1077,26 @@ class ApiGameCompleteView(APIView):
             
             return JsonResponse(response_data)
         except Exception as e:
-            # Close connection even on error
-            connections['default'].close()
             return JsonResponse({'error': f'Failed to save result: {str(e)}'}, status=500)
 
 
+_GAME_STATE_BODY = _json_dumps({'error': 'Game state is managed in frontend only.'})
+_GAME_ABANDON_BODY = _json_dumps({'ok': True, 'message': 'Game abandoned (no server action needed).'})
+
+
 class ApiGameStateView(View):
     """Get game state - NOT USED (game state is in frontend only)"""
-    def get(self, request: HttpRequest) -> JsonResponse:
-        return JsonResponse({'error': 'Game state is managed in frontend only.'}, status=400)
+    def get(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(_GAME_STATE_BODY, status=400, content_type='application/json')
 
 
 class ApiGameAbandonView(View):
     """Abandon game - NOT USED (game state is in frontend only)"""
-    def post(self, request: HttpRequest) -> JsonResponse:
-        return JsonResponse({'ok': True, 'message': 'Game abandoned (no server action needed).'})
+    def post(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(_GAME_ABANDON_BODY, content_type='application/json')
 
 
-class ApiLeaderboardView(APIView):
+class ApiLeaderboardView(_JsonAPIView):
     """Get leaderboard - shows top game results ranked by score in descending order - NO AUTH REQUIRED"""
     
     @swagger_auto_schema(
@@ -866,54 +1131,30 @@ class ApiLeaderboardView(APIView):
     def get(self, request):
         # No authentication required for viewing leaderboard
         
-        try:
-            limit = int(request.GET.get('limit', 100))
-            limit = min(max(limit, 1), 1000)  # Between 1 and 1000
-            
-            # Get top game results sorted by score (descending), then by duration (ascending)
-            # Filter for Bulls and Bears game only
-            leaderboard_results = (
-                GameResult.objects
-                .filter(game_name='Bulls and Bears')
-                .order_by('-absolute_score', 'duration', '-created_at')[:limit]
-            )
-            
-            data = []
-            for rank, result in enumerate(leaderboard_results, start=1):
-                # Extract player name and game info from game_session_data JSON
-                player_name = result.player_id or 'Anonymous'
-                secret_word = 'XXXXX'
-                attempts_used = 0
-                status = 'unknown'
-                
-                if result.game_session_data:
-                    try:
-                        game_data = json.loads(result.game_session_data)
-                        player_name = game_data.get('player_name', player_name)
-                        secret_word = game_data.get('secret_word', secret_word).upper()
-                        attempts_used = game_data.get('attempts_used', attempts_used)
-                        status = game_data.get('status', status)
-                    except:
-                        pass
-                
-                # Only show won games on leaderboard
-                if status != 'won':
-                    continue
-                
-                data.append({
-                    'rank': rank,
-                    'player_name': player_name,
-                    'score': round(result.absolute_score, 2),
-                    'secret_word': secret_word,
-                    'attempts_used': attempts_used,
-                    'time_taken': round(result.duration, 2) if result.duration else 0.0,
-                    'created_at': result.created_at.isoformat()
-                })
-            
-            return JsonResponse({'leaderboard': data})
-        finally:
-            # Always close the database connection
-            connections['default'].close()
+        limit = int(request.GET.get('limit', 100))
+        limit = min(max(limit, 1), 1000)  # Between 1 and 1000
+        
+        # Serve the cached body (and its ETag) until the TTL lapses or a new win is recorded.
+        key = _leaderboard_cache_key(limit)
+        cached = cache.get(key)
+        if cached is None:
+            body = _leaderboard_body(limit)
+            cached = ('"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest(), body)
+            cache.set(key, cached, LEADERBOARD_CACHE_TTL_SECONDS)
+        
+        etag, body = cached
+        response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        # A new win changes the cache key in every worker at once, so clients (and any proxy)
+        # revalidate every time instead of holding a copy; an unchanged board answers 304
+        # after one index-only MAX query.
+        patch_cache_control(response, public=True, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
+
+
+def _session_player_name(session: AuthSession) -> str:
+    # Results are stored under the name the frontend plays as (member name, else username)
+    return (session.member.name if session.member else '') or session.user.username
 
 
 class ApiPlayerStatsView(View):
@@ -923,46 +1164,49 @@ class ApiPlayerStatsView(View):
         if session is None or not session.user.is_active:
             return JsonResponse({'error': 'Unauthorized'}, status=401)
 
-        # Get stats from gameresults
-        from django.db.models import Sum, Count, Avg, Max
-        
-        player_stats = GameResult.objects.filter(
-            user=session.user,
-            member=session.member
-        ).aggregate(
-            total_games=Count('id'),
-            total_wins=Count('id', filter=Q(status='won')),
-            total_losses=Count('id', filter=Q(status='lost')),
-            total_score=Sum('score'),
-            avg_attempts=Avg('attempts_used'),
-            best_time=Max('time_taken', filter=Q(status='won'))
+        player_games = GameResult.objects.filter(
+            game_name='Bulls and Bears',
+            player_id=_session_player_name(session)
         )
         
-        # Get recent games
-        recent_results = GameResult.objects.filter(
-            user=session.user,
-            member=session.member
-        ).order_by('-created_at')[:10]
+        # Get stats from gameresults; status decides a win, as on the leaderboard
+        won = Q(status='won')
+        player_stats = player_games.aggregate(
+            total_games=Count('result_id'),
+            total_wins=Count('result_id', filter=won),
+            total_losses=Count('result_id', filter=~won),
+            total_score=Sum('absolute_score'),
+            total_attempts=Sum('attempts_used'),
+            best_time=Max('duration', filter=won)
+        )
         
         recent_games_data = [
             {
-                'round_id': result.game_round_id,
-                'status': result.status,
-                'attempts_used': result.attempts_used,
-                'total_score': result.score,
-                'secret_word': result.secret_word,
-                'time_taken': result.time_taken,
-                'created_at': result.created_at.isoformat()
+                'round_id': result_id,
+                'status': status or 'unknown',
+                'attempts_used': attempts_used or 0,
+                'total_score': absolute_score,
+                'secret_word': secret_word or '',
+                'time_taken': duration,
+                'created_at': created_at.isoformat()
             }
-            for result in recent_results
+            for result_id, status, attempts_used, absolute_score, secret_word, duration, created_at in (
+                player_games.order_by('-created_at')
+                .values_list('result_id', 'status', 'attempts_used', 'absolute_score', 'secret_word', 'duration', 'created_at')
+                [:10]
+            )
         ]
         
+        total_games = player_stats['total_games'] or 0
+        total_attempts = player_stats['total_attempts'] or 0
+        avg_attempts = total_attempts / total_games if total_games else 0
+        
         stats = {
-            'total_rounds': player_stats['total_games'] or 0,
+            'total_rounds': total_games,
             'rounds_won': player_stats['total_wins'] or 0,
             'rounds_lost': player_stats['total_losses'] or 0,
             'total_score': round(player_stats['total_score'], 2) if player_stats['total_score'] else 0.0,
-            'average_attempts': round(player_stats['avg_attempts'], 2) if player_stats['avg_attempts'] else 0.0,
+            'average_attempts': round(avg_attempts, 2) if avg_attempts else 0.0,
             'best_time': round(player_stats['best_time'], 2) if player_stats['best_time'] else None,
             'recent_games': recent_games_data
         }
@@ -970,6 +1214,28 @@ class ApiPlayerStatsView(View):
         return JsonResponse(stats)
 
 
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_CURSOR_TICK = timedelta(microseconds=1)
+
+
+def _history_cursor(created_at: datetime, result_id: int) -> str:
+    # "<created_at epoch µs>_<result_id>" of the last row on the page: digits only, so it
+    # survives a query string unencoded (an ISO "+00:00" offset would decode to a space).
+    if timezone.is_naive(created_at):
+        created_at = created_at.replace(tzinfo=dt_timezone.utc)
+    return f'{(created_at - _CURSOR_EPOCH) // _CURSOR_TICK}_{result_id}'
+
+
+def _parse_history_cursor(raw: str) -> tuple[datetime, int] | None:
+    micros, _, result_id = raw.partition('_')
+    try:
+        created_at = _CURSOR_EPOCH + int(micros) * _CURSOR_TICK
+        result_id = int(result_id)
+    except (ValueError, OverflowError):
+        return None
+    return (created_at if settings.USE_TZ else created_at.replace(tzinfo=None)), result_id
+
+
 class ApiGameHistoryView(View):
     """Get game history with timeline"""
     def get(self, request: HttpRequest) -> JsonResponse:
@@ -977,44 +1243,61 @@ class ApiGameHistoryView(View):
         if session is None or not session.user.is_active:
             return JsonResponse({'error': 'Unauthorized'}, status=401)
 
-        page = int(request.GET.get('page', 1))
         page_size = int(request.GET.get('page_size', 20))
         page_size = min(max(page_size, 1), 100)
         
-        offset = (page - 1) * page_size
+        player_games = GameResult.objects.filter(game_name='Bulls and Bears', player_id=_session_player_name(session))
         
-        games = GameResult.objects.filter(
-            user=session.user,
-            member=session.member
-        ).order_by('-created_at')[offset:offset + page_size]
+        # Keyset pagination: seek past the previous page's last (created_at, result_id)
+        # instead of reading and discarding OFFSET rows on every page.
+        games = player_games
+        cursor = request.GET.get('cursor')
+        if cursor:
+            parsed = _parse_history_cursor(cursor)
+            if parsed is None:
+                return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+            created_at, result_id = parsed
+            games = games.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, result_id__lt=result_id)
+            )
         
-        total_count = GameResult.objects.filter(
-            user=session.user,
-            member=session.member
-        ).count()
+        # One extra row answers has_more without a COUNT(*)
+        rows = list(
+            games.order_by('-created_at', '-result_id')
+            .values_list('result_id', 'status', 'attempts_used', 'secret_word', 'absolute_score', 'start_time', 'end_time', 'created_at')
+            [:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
         
         games_data = []
-        for game in games:
-            game_state = json.loads(game.game_state) if game.game_state else {}
-            
+        for result_id, status, attempts_used, secret_word, absolute_score, start_time, end_time, created_at in rows:
+            status = status or 'unknown'
             games_data.append({
-                'round_id': game.id,
-                'status': game.status,
-                'secret_word': game.secret_word.upper() if game.status in ['won', 'lost', 'abandoned'] else None,
-                'attempts_used': game.attempts_used,
-                'max_attempts': game_state.get('max_attempts', 6),
-                'total_score': game.score,
-                'started_at': game_state.get('started_at', game.created_at.isoformat()),
-                'completed_at': game_state.get('completed_at')
+                'round_id': result_id,
+                'status': status,
+                'secret_word': (secret_word or '').upper() if status in ['won', 'lost', 'abandoned'] else None,
+                'attempts_used': attempts_used or 0,
+                'max_attempts': 6,
+                'total_score': absolute_score,
+                'started_at': start_time.isoformat() if start_time else created_at.isoformat(),
+                'completed_at': end_time.isoformat() if end_time else None
             })
         
-        return JsonResponse({
+        response_data = {
             'games': games_data,
-            'total_count': total_count,
-            'page': page,
             'page_size': page_size,
-            'has_more': total_count > (offset + page_size)
-        })
+            'has_more': has_more,
+            'next_cursor': _history_cursor(rows[-1][7], rows[-1][0]) if has_more else None,
+        }
+        # Totals cost a scan of the player's games, so they are opt-in. A first page that
+        # already holds every game is its own total.
+        if request.GET.get('include_total') == '1':
+            if not cursor and not has_more:
+                response_data['total_count'] = len(rows)
+            else:
+                response_data['total_count'] = player_games.count()
+        return JsonResponse(response_data)
 
 
 class ApiPerformanceAnalyticsView(APIView):
@@ -1055,7 +1338,19 @@ class ApiPerformanceAnalyticsView(APIView):
                 .order_by('-created_at')
             )
             
-            total_games = all_games.count()
+            # Counts, sums and extremes in one query; status decides a win, as on the
+            # leaderboard. NULL score/duration count as 0.
+            won = Q(status='won')
+            stats = all_games.aggregate(
+                total_games=Count('result_id'),
+                total_wins=Count('result_id', filter=won),
+                total_score=Sum(Coalesce('absolute_score', 0)),
+                total_duration=Sum(Coalesce('duration', 0)),
+                total_attempts=Sum(Coalesce('attempts_used', 0)),
+                best_score=Max(Coalesce('absolute_score', 0)),
+                fastest_win=Min(Coalesce('duration', 0), filter=won),
+            )
+            total_games = stats['total_games']
             
             if total_games == 0:
                 # Return empty analytics for new players
@@ -1073,79 +1368,40 @@ class ApiPerformanceAnalyticsView(APIView):
                     'recent_games': []
                 })
             
-            # Calculate statistics
-            total_wins = 0
-            total_losses = 0
-            total_score = 0
-            total_attempts = 0
-            total_duration = 0
-            best_score = 0
-            fastest_win = None
-            attempts_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
-            
-            recent_games_data = []
+            total_wins = stats['total_wins']
+            total_losses = total_games - total_wins
+            total_score = stats['total_score'] or 0
+            total_duration = stats['total_duration'] or 0
+            best_score = max(stats['best_score'] or 0, 0)
+            fastest_win = stats['fastest_win']
+            total_attempts = stats['total_attempts'] or 0
             
-            for result in all_games[:10]:  # Get recent 10 games for chart
-                # Parse game_session_data JSON
-                game_data = {}
-                if result.game_session_data:
-                    try:
-                        game_data = json.loads(result.game_session_data)
-                    except:
-                        pass
-                
-                status = game_data.get('status', 'unknown')
-                attempts_used = game_data.get('attempts_used', 0)
-                time_taken = result.duration or 0
-                score = result.absolute_score or 0
-                
-                # Add to recent games
-                recent_games_data.append({
-                    'result_id': result.result_id,
-                    'status': status,
-                    'absolute_score': score,
-                    'attempts_used': attempts_used,
-                    'duration': time_taken,
-                    'secret_word': game_data.get('secret_word', '').upper(),
-                    'created_at': result.created_at.isoformat()
-                })
+            # Attempts distribution (only for wins), grouped in SQL; only 1-6 make the chart
+            won_counts = dict(
+                all_games.filter(won, attempts_used__range=(1, 6))
+                .order_by()
+                .values_list('attempts_used')
+                .annotate(n=Count('result_id'))
+            )
+            attempts_distribution = {n: won_counts.get(n, 0) for n in range(1, 7)}
             
-            # Calculate aggregate stats from ALL games
-            for result in all_games:
-                game_data = {}
-                if result.game_session_data:
-                    try:
-                        game_data = json.loads(result.game_session_data)
-                    except:
-                        pass
-                
-                status = game_data.get('status', 'unknown')
-                attempts_used = game_data.get('attempts_used', 0)
-                time_taken = result.duration or 0
-                score = result.absolute_score or 0
-                
-                # Count wins/losses
-                if status == 'won':
-                    total_wins += 1
-                    
-                    # Track fastest win
-                    if fastest_win is None or time_taken < fastest_win:
-                        fastest_win = time_taken
-                    
-                    # Track attempts distribution (only for wins)
-                    if 1 <= attempts_used <= 6:
-                        attempts_distribution[attempts_used] += 1
-                else:
-                    total_losses += 1
-                
-                # Accumulate totals
-                total_score += score
-                total_attempts += attempts_used
-                total_duration += time_taken
-                
-                # Track best score
-                if score > best_score:
-                    best_score = score
+            # Recent 10 games for chart
+            recent_games_data = [
+                {
+                    'result_id': result_id,
+                    'status': status or 'unknown',
+                    'absolute_score': score or 0,
+                    'attempts_used': attempts_used or 0,
+                    'duration': duration or 0,
+                    'secret_word': (secret_word or '').upper(),
+                    'created_at': created_at.isoformat()
+                }
+                for result_id, status, score, attempts_used, duration, secret_word, created_at in (
+                    all_games.values_list(
+                        'result_id', 'status', 'absolute_score', 'attempts_used', 'duration', 'secret_word', 'created_at',
+                    )[:10]
+                )
+            ]
             
             # Calculate averages
             win_rate = (total_wins / total_games * 100) if total_games > 0 else 0.0
@@ -1168,9 +1424,6 @@ class ApiPerformanceAnalyticsView(APIView):
             })
         except Exception as e:
             return JsonResponse({'error': f'Failed to fetch analytics: {str(e)}'}, status=500)
-        finally:
-            # Always close the database connection
-            connections['default'].close()
 
 
 class ApiCoinsView(APIView):
@@ -1197,8 +1450,9 @@ class ApiCoinsView(APIView):
         if session is None or not session.user.is_active or session.member is None:
             return JsonResponse({'error': 'Unauthorized'}, status=401)
         
-        # Refresh member data to get latest coins
-        session.member.refresh_from_db()
+        # Refresh only the balance: the session (and its member) may come from the session cache,
+        # which coin updates don't invalidate, so the cached value can't be returned as is.
+        session.member.refresh_from_db(fields=['coins'])
         
         return JsonResponse({
             'coins': session.member.coins
@@ -1253,19 +1507,15 @@ class ApiHintView(APIView):
         if not secret_word or len(secret_word) != 5:
             return JsonResponse({'error': 'Secret word is required'}, status=400)
         
-        # Check if user has enough coins
-        session.member.refresh_from_db()
         HINT_COST = 10
         
-        if session.member.coins < HINT_COST:
-            return JsonResponse({
-                'error': 'Not enough coins',
-                'required': HINT_COST,
-                'available': session.member.coins
-            }, status=400)
-        
-        # Find positions that are NOT already revealed (not marked as correct)
-        available_positions = [i for i in range(5) if i not in revealed_positions]
+        # Find positions that are NOT already revealed (not marked as correct); the set makes
+        # each check a hash lookup and rejects a malformed payload up front
+        try:
+            revealed = frozenset(revealed_positions)
+        except TypeError:
+            return JsonResponse({'error': 'Invalid revealed positions'}, status=400)
+        available_positions = tuple(i for i in range(5) if i not in revealed)
         
         if not available_positions:
             return JsonResponse({'error': 'All positions already revealed or correct'}, status=400)
@@ -1274,28 +1524,116 @@ class ApiHintView(APIView):
         hint_position = random.choice(available_positions)
         hint_letter = secret_word[hint_position]
         
-        # Deduct coins using atomic transaction
-        with transaction.atomic():
-            member = AppUserMember.objects.select_for_update().get(id=session.member.id)
-            
-            # Double-check coins in case of race condition
-            if member.coins < HINT_COST:
-                return JsonResponse({
-                    'error': 'Not enough coins',
-                    'required': HINT_COST,
-                    'available': member.coins
-                }, status=400)
-            
-            member.coins -= HINT_COST
-            member.save(update_fields=['coins'])
-            
+        # Deduct coins; the UPDATE only matches while the balance covers the cost
+        spent, coins = _spend_coins(session.member.id, HINT_COST)
+        if not spent:
             return JsonResponse({
-                'hint': {
-                    'position': hint_position,
-                    'letter': hint_letter
-                },
-                'remaining_coins': member.coins
-            })
+                'error': 'Not enough coins',
+                'required': HINT_COST,
+                'available': coins
+            }, status=400)
+        
+        return JsonResponse({
+            'hint': {
+                'position': hint_position,
+                'letter': hint_letter
+            },
+            'remaining_coins': coins
+        })
+
+
+# Keep-alive pool for the dictionary API, so cache misses skip the TCP/TLS handshake.
+_DICTIONARY_HTTP = requests.Session()
+_DICTIONARY_HTTP.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+# Dictionary entries practically never change.
+WORD_MEANING_CACHE_TTL_SECONDS = 60 * 60 * 24 * 30
+# Lookups run on a sync gunicorn worker, so bound how long one can hold it: (connect, read).
+_DICTIONARY_TIMEOUT = (2, 3)
+# After a connection failure or timeout, answer misses with the fallback for this long
+# instead of letting every request wait out the timeout again. Bad statuses and payloads
+# only concern the word asked for, so they fall back for that word alone.
+_DICTIONARY_BACKOFF_SECONDS = 30
+_dictionary_retry_at = 0.0
+
+
+def _fallback_word_meaning(word: str) -> dict:
+    return {
+        'word': word.upper(),
+        'meaning': f'A five-letter word: {word.upper()}',
+        'definitions': [f'"{word.upper()}" is a valid English word.'],
+        'parts_of_speech': []
+    }
+
+
+@lru_cache(maxsize=8192)
+def _word_meaning(word: str) -> dict:
+    # Two tiers: this process's lru_cache, then the Django cache (shared when Redis is set).
+    # Upstream errors raise, and lru_cache/cache.set never see them, so outages aren't pinned.
+    # Callers must not mutate the returned dict.
+    global _dictionary_retry_at
+    key = f'wm:{word}'
+    payload = cache.get(key)
+    if payload is None:
+        if time.monotonic() < _dictionary_retry_at:
+            raise RuntimeError('dictionary API backing off after a failure')
+        try:
+            payload = _fetch_word_meaning(word)
+        except (requests.ConnectionError, requests.Timeout):
+            _dictionary_retry_at = time.monotonic() + _DICTIONARY_BACKOFF_SECONDS
+            raise
+        cache.set(key, payload, WORD_MEANING_CACHE_TTL_SECONDS)
+    return payload
+
+
+def _fetch_word_meaning(word: str) -> dict:
+    # Use Free Dictionary API
+    api_url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+    
+    response = _DICTIONARY_HTTP.get(api_url, timeout=_DICTIONARY_TIMEOUT)
+    
+    # 404 is the API's definitive "no entry", so the fallback is as cacheable as a hit
+    if response.status_code == 404:
+        return _fallback_word_meaning(word)
+    response.raise_for_status()
+    
+    data = response.json()
+    if not data:
+        return _fallback_word_meaning(word)
+    
+    entry = data[0]
+    
+    # Extract all definitions and parts of speech
+    all_definitions = []
+    parts_of_speech = []
+    meaning_parts = []
+    
+    if 'meanings' in entry:
+        for meaning in entry['meanings']:
+            pos = meaning.get('partOfSpeech', 'Unknown')
+            if pos not in parts_of_speech:
+                parts_of_speech.append(pos)
+            
+            definitions = meaning.get('definitions', [])
+            if definitions and len(definitions) > 0:
+                # Add first definition for primary meaning
+                first_def = definitions[0].get('definition', '')
+                if first_def and len(meaning_parts) < 2:
+                    meaning_parts.append(f"{pos.capitalize()}: {first_def}")
+                
+                # Add all definitions to list
+                for idx, defn in enumerate(definitions[:3]):  # Limit to 3 per part of speech
+                    definition_text = defn.get('definition', '')
+                    if definition_text:
+                        all_definitions.append(f"({pos.capitalize()}) {definition_text}")
+    
+    primary_meaning = meaning_parts[0] if meaning_parts else f"A {parts_of_speech[0] if parts_of_speech else 'word'}"
+    
+    return {
+        'word': word.upper(),
+        'meaning': primary_meaning,
+        'definitions': all_definitions[:4],  # Limit to 4 definitions
+        'parts_of_speech': parts_of_speech
+    }
 
 
 class ApiWordMeaningView(APIView):
@@ -1329,68 +1667,23 @@ class ApiWordMeaningView(APIView):
         if not word:
             return JsonResponse({'error': 'Word parameter is required'}, status=400)
         
+        # Only plain words go upstream (and into the caches); anything else can't have an entry.
         try:
-            # Use Free Dictionary API
-            api_url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-            
-            response = requests.get(api_url, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data and len(data) > 0:
-                    entry = data[0]
-                    
-                    # Extract all definitions and parts of speech
-                    all_definitions = []
-                    parts_of_speech = []
-                    meaning_parts = []
-                    
-                    if 'meanings' in entry:
-                        for meaning in entry['meanings']:
-                            pos = meaning.get('partOfSpeech', 'Unknown')
-                            if pos not in parts_of_speech:
-                                parts_of_speech.append(pos)
-                            
-                            definitions = meaning.get('definitions', [])
-                            if definitions and len(definitions) > 0:
-                                # Add first definition for primary meaning
-                                first_def = definitions[0].get('definition', '')
-                                if first_def and len(meaning_parts) < 2:
-                                    meaning_parts.append(f"{pos.capitalize()}: {first_def}")
-                                
-                                # Add all definitions to list
-                                for idx, defn in enumerate(definitions[:3]):  # Limit to 3 per part of speech
-                                    definition_text = defn.get('definition', '')
-                                    if definition_text:
-                                        all_definitions.append(f"({pos.capitalize()}) {definition_text}")
-                    
-                    primary_meaning = meaning_parts[0] if meaning_parts else f"A {parts_of_speech[0] if parts_of_speech else 'word'}"
-                    
-                    return JsonResponse({
-                        'word': word.upper(),
-                        'meaning': primary_meaning,
-                        'definitions': all_definitions[:4],  # Limit to 4 definitions
-                        'parts_of_speech': parts_of_speech
-                    })
-            
-            # If API fails, return fallback
-            return JsonResponse({
-                'word': word.upper(),
-                'meaning': f'A five-letter word: {word.upper()}',
-                'definitions': [f'"{word.upper()}" is a valid English word.'],
-                'parts_of_speech': []
-            }, status=200)
-            
+            if not word.isalpha() or len(word) > 32:
+                meaning = _fallback_word_meaning(word)
+            else:
+                meaning = _word_meaning(word)
         except Exception as e:
-            # Fallback if API fails
-            print(f"[ERROR] Dictionary API failed for word '{word}': {str(e)}")
-            return JsonResponse({
-                'word': word.upper(),
-                'meaning': f'A five-letter word: {word.upper()}',
-                'definitions': [f'"{word.upper()}" is a valid English word.'],
-                'parts_of_speech': []
-            }, status=200)
+            # Fallback if API fails; not cached, so the next request retries upstream
+            logger.warning("Dictionary API failed for word '%s': %s", word, e)
+            return JsonResponse(_fallback_word_meaning(word))
+        
+        # Same lifetime as the server-side cache: browsers and proxies keep the answer too
+        response = JsonResponse(meaning)
+        etag = '"%s"' % hashlib.md5(response.content, usedforsecurity=False).hexdigest()
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=WORD_MEANING_CACHE_TTL_SECONDS, immutable=True)
+        return get_conditional_response(request, etag=etag, response=response)
 
 
 class ApiDeductCoinsMeaningView(APIView):
@@ -1424,34 +1717,19 @@ class ApiDeductCoinsMeaningView(APIView):
         if session is None or not session.user.is_active or session.member is None:
             return JsonResponse({'error': 'Unauthorized'}, status=401)
         
-        # Check if member has enough coins
-        session.member.refresh_from_db()
         MEANING_COST = 5
         
-        if session.member.coins < MEANING_COST:
+        # Deduct coins (same guarded UPDATE as ApiHintView)
+        spent, coins = _spend_coins(session.member.id, MEANING_COST)
+        if not spent:
             return JsonResponse({
                 'error': 'Not enough coins',
                 'required': MEANING_COST,
-                'current': session.member.coins
+                'current': coins
             }, status=400)
         
-        # Deduct coins using atomic transaction (same pattern as ApiHintView)
-        with transaction.atomic():
-            member = AppUserMember.objects.select_for_update().get(id=session.member.id)
-            
-            # Double-check coins in case of race condition
-            if member.coins < MEANING_COST:
-                return JsonResponse({
-                    'error': 'Not enough coins',
-                    'required': MEANING_COST,
-                    'current': member.coins
-                }, status=400)
-            
-            member.coins -= MEANING_COST
-            member.save(update_fields=['coins'])
-            
-            return JsonResponse({
-                'success': True,
-                'coins_deducted': MEANING_COST,
-                'remaining_coins': member.coins
-            })
+        return JsonResponse({
+            'success': True,
+            'coins_deducted': MEANING_COST,
+            'remaining_coins': coins
+        })
@@ -1,80 +1,264 @@
 #!/usr/bin/env python3
 """Test the Dictionary API implementation"""
 
+import atexit
+import os
 import requests
 import json
+import shelve
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
-def test_free_dictionary_api(word):
-    """Test the Free Dictionary API directly"""
-    print(f"\n{'='*60}")
-    print(f"Testing word: {word.upper()}")
-    print(f"{'='*60}")
-    
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+# Words exercised by both the script and the pytest run
+TEST_WORDS = ["quest", "addle", "crane", "house", "swift"]
+
+# Both accept the raw response bytes, so there is no intermediate str decode
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+class _LoggedRetry(Retry):
+    """Retry that reports each retry it schedules, so flaky runs stay diagnosable."""
+
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        # Raises once the attempts are used up, so only real retries are reported
+        retry = super().increment(method, url, response, error, *args, **kwargs)
+        reason = error if error is not None else f"status {response.status}"
+        print(f"↻ Retrying {url} after {reason}", file=sys.stderr)
+        return retry
+
+# Ride out dropped connections and transient 429/5xx instead of failing the word. GETs
+# only, with exponential backoff and jitter; once retries run out the last response is
+# returned (raise_on_status=False) so the report still shows its status.
+RETRY = _LoggedRetry(
+    total=3,
+    backoff_factor=0.3,
+    backoff_jitter=0.1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False,
+)
+
+# (connect, read) seconds, a little above what a healthy API takes, so a dead host gives up
+# quickly. Worst case per word is 4 attempts * 3s plus ~1.8s of backoff, which is
+# longer than the old single 5s attempt but only when every attempt hangs.
+TIMEOUT = (1.0, 2.0)
+
+# Lookups run on up to MAX_WORKERS threads
+MAX_WORKERS = 8
+
+# One keep-alive pool for every lookup: after the first word, the rest skip the
+# TCP/TLS handshake. urllib3's pool is safe for the concurrent lookups below, and
+# holds a connection per worker. requests only speaks HTTP/1.1, so concurrent lookups
+# can't share one multiplexed connection; pool_block caps the sockets at MAX_WORKERS
+# instead of opening throwaway extras.
+SESSION = requests.Session()
+# Ask for a compressed body explicitly: gzip/deflate always, plus br/zstd when brotli or
+# zstandard is installed, since urllib3 only advertises encodings it can decode.
+SESSION.headers.update(make_headers(accept_encoding=True))
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, pool_block=True, max_retries=RETRY))
+
+# Entries practically never change, so successful lookups also persist across runs.
+# Delete the file (or set DICTIONARY_CACHE_PATH) to start fresh. shelve may be backed by
+# dbm.dumb, which has no cross-process locking, so each pytest-xdist worker (gw0, gw1, ...)
+# gets its own file.
+DISK_CACHE_PATH = (
+    (os.getenv('DICTIONARY_CACHE_PATH') or os.path.join(tempfile.gettempdir(), 'bullsandbears_dictionary_cache'))
+    + (f"-{os.environ['PYTEST_XDIST_WORKER']}" if os.getenv('PYTEST_XDIST_WORKER') else '')
+)
+DISK_CACHE_TTL_SECONDS = 60 * 60 * 24 * 30
+# shelve allows one writer at a time; lookups run on several threads
+_DISK_CACHE_LOCK = threading.Lock()
+_disk_cache = None
+
+def _disk_cache_db():
+    # Opened once per run and shared by every lookup, rather than reopened for each
+    # read and write; closing at exit flushes it. Call with _DISK_CACHE_LOCK held.
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = shelve.open(DISK_CACHE_PATH)
+        atexit.register(_disk_cache.close)
+    return _disk_cache
+
+def _disk_cache_get(word):
+    with _DISK_CACHE_LOCK:
+        stored = _disk_cache_db().get(word)
+    if stored is None:
+        return None
+    stored_at, data = stored
+    return data if time.time() - stored_at < DISK_CACHE_TTL_SECONDS else None
+
+def _disk_cache_set(word, data):
+    with _DISK_CACHE_LOCK:
+        _disk_cache_db()[word] = (time.time(), data)
+
+# Circuit breaker: once this many lookups in a row have failed even after their retries,
+# the API is treated as down and the remaining words fail fast instead of each waiting out
+# its own timeouts. Any answer (a 404 included) closes it again.
+BREAKER_THRESHOLD = 3
+_BREAKER_LOCK = threading.Lock()
+_consecutive_failures = 0
+
+def _record_outcome(failed):
+    global _consecutive_failures
+    with _BREAKER_LOCK:
+        _consecutive_failures = _consecutive_failures + 1 if failed else 0
+
+@lru_cache(maxsize=1024)
+def _fetch_json(word):
+    # Entries are deterministic, so a word seen again is answered from memory, or from
+    # disk on a later run. Anything but a 200 raises, and neither cache stores exceptions,
+    # so a failed word is retried.
+    data = _disk_cache_get(word)
+    if data is not None:
+        return data
+    # Cached entries are still served while the breaker is open
+    if _consecutive_failures >= BREAKER_THRESHOLD:
+        raise requests.ConnectionError(
+            f"Skipped: dictionary API failed {_consecutive_failures} lookups in a row"
+        )
     api_url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+    try:
+        response = SESSION.get(api_url, timeout=TIMEOUT)
+    except requests.RequestException:
+        _record_outcome(failed=True)
+        raise
+    _record_outcome(failed=response.status_code == 429 or response.status_code >= 500)
+    if response.status_code != 200:
+        raise requests.HTTPError(f"API returned status {response.status_code}", response=response)
+    data = _json_loads(response.content)
+    _disk_cache_set(word, data)
+    return data
+
+def _lookup(word):
+    """Return (status_code, data, text) for ``word``; data is None unless the status is 200."""
+    try:
+        return 200, _fetch_json(word.lower()), None
+    except requests.HTTPError as e:
+        return e.response.status_code, None, e.response.text
+
+def check_free_dictionary_api(word):
+    """Test the Free Dictionary API directly
+
+    Returns (ok, lines): the report is collected rather than printed, so words
+    looked up concurrently don't interleave their output.
+    """
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"Testing word: {word.upper()}")
+    lines.append(f"{'='*60}")
     
     try:
-        response = requests.get(api_url, timeout=5)
-        print(f"Status Code: {response.status_code}")
+        status_code, data, text = _lookup(word)
+        lines.append(f"Status Code: {status_code}")
         
-        if response.status_code == 200:
-            data = response.json()
-            
+        if status_code == 200:
             if data and len(data) > 0:
                 entry = data[0]
-                print(f"\n✅ Word found: {entry.get('word', word).upper()}")
+                lines.append(f"\n✅ Word found: {entry.get('word', word).upper()}")
                 
-                # Extract all definitions and parts of speech
-                all_definitions = []
-                parts_of_speech = []
-                meaning_parts = []
+                # One pass over the meanings collects the parts of speech, the primary
+                # meaning, the definition count (up to 3 per part of speech) and the first
+                # 4 definitions: only those are printed, so only those are formatted.
+                parts_of_speech = {}  # insertion-ordered set: O(1) dedup, first-seen order
+                primary_meaning = None
+                definition_count = 0
+                shown_definitions = []
                 
-                if 'meanings' in entry:
-                    for meaning in entry['meanings']:
-                        pos = meaning.get('partOfSpeech', 'Unknown')
-                        if pos not in parts_of_speech:
-                            parts_of_speech.append(pos)
-                        
-                        definitions = meaning.get('definitions', [])
-                        if definitions and len(definitions) > 0:
-                            # Add first definition for primary meaning
-                            first_def = definitions[0].get('definition', '')
-                            if first_def and len(meaning_parts) < 2:
-                                meaning_parts.append(f"{pos.capitalize()}: {first_def}")
-                            
-                            # Add all definitions to list
-                            for idx, defn in enumerate(definitions[:3]):
-                                definition_text = defn.get('definition', '')
-                                if definition_text:
-                                    all_definitions.append(f"({pos.capitalize()}) {definition_text}")
+                for meaning in entry.get('meanings') or ():
+                    pos = meaning.get('partOfSpeech', 'Unknown')
+                    parts_of_speech[pos] = None
+                    
+                    definitions = meaning.get('definitions') or ()
+                    if not definitions:
+                        continue
+                    pos_cap = pos.capitalize()
+                    
+                    # Primary meaning: first definition of the first part of speech that has one
+                    if primary_meaning is None:
+                        first_def = definitions[0].get('definition')
+                        if first_def:
+                            primary_meaning = f"{pos_cap}: {first_def}"
+                    
+                    for defn in definitions[:3]:
+                        definition_text = defn.get('definition')
+                        if definition_text:
+                            definition_count += 1
+                            if len(shown_definitions) < 4:
+                                shown_definitions.append(f"({pos_cap}) {definition_text}")
                 
-                primary_meaning = meaning_parts[0] if meaning_parts else "Definition found"
+                primary_meaning = primary_meaning or "Definition found"
                 
-                print(f"\nParts of Speech: {', '.join(parts_of_speech)}")
-                print(f"\nPrimary Meaning:")
-                print(f"  {primary_meaning}")
-                print(f"\nAll Definitions ({len(all_definitions)}):")
-                for i, defn in enumerate(all_definitions[:4], 1):
-                    print(f"  {i}. {defn}")
+                lines.append(f"\nParts of Speech: {', '.join(parts_of_speech)}")
+                lines.append(f"\nPrimary Meaning:")
+                lines.append(f"  {primary_meaning}")
+                lines.append(f"\nAll Definitions ({definition_count}):")
+                for i, defn in enumerate(shown_definitions, 1):
+                    lines.append(f"  {i}. {defn}")
                 
-                return True
+                return True, lines
         else:
-            print(f"❌ API returned status {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
+            lines.append(f"❌ API returned status {status_code}")
+            lines.append(f"Response: {text}")
+            return False, lines
             
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
+        lines.append(f"❌ Error: {str(e)}")
+        return False, lines
+    
+    return False, lines
+
+if pytest is not None:
+    # `pytest test_dictionary.py` reports each word as its own test (add `-n auto` with
+    # pytest-xdist to spread them over processes). Hits the live API.
+    @pytest.mark.parametrize("word", TEST_WORDS)
+    def test_free_dictionary_api(word):
+        ok, lines = check_free_dictionary_api(word)
+        assert ok, "\n".join(lines)
+
+def main(test_words):
+    # The lookups only wait on the network (requests releases the GIL meanwhile), so run
+    # them on threads: total time is the slowest word rather than the sum of all of them.
+    # A repeated word shares the first one's lookup, even while it is still in flight.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        lookups = {}
+        for word in test_words:
+            if word.lower() not in lookups:
+                lookups[word.lower()] = executor.submit(check_free_dictionary_api, word)
+        return [lookups[word.lower()].result() for word in test_words]
 
 if __name__ == "__main__":
     # Test with various words
-    test_words = ["quest", "addle", "crane", "house", "swift"]
+    test_words = TEST_WORDS
+    
+    results = main(test_words)
     
+    # Reports come back in test_words order, whichever lookup finished first. Each one
+    # goes out in a single write rather than a print() per line.
     success_count = 0
-    for word in test_words:
-        if test_free_dictionary_api(word):
+    for ok, lines in results:
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+        if ok:
             success_count += 1
     
-    print(f"\n{'='*60}")
-    print(f"Results: {success_count}/{len(test_words)} words successfully fetched")
-    print(f"{'='*60}\n")
+    sys.stdout.write(
+        f"\n{'='*60}\n"
+        f"Results: {success_count}/{len(test_words)} words successfully fetched\n"
+        f"{'='*60}\n\n"
+    )